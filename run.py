@@ -1,20 +1,45 @@
+import argparse
 import uvicorn
 from src.db.session import init_db
 from src.core.config import config
 from src.core.logging import logger
 
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Run the EGP pipeline API')
+    parser.add_argument('--reset',
+                       action='store_true',
+                       help='Drop and recreate the announcements table before starting')
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+    
     try:
-        # Initialize database
-        init_db()
+        # Initialize database (non-destructive unless --reset is given)
+        init_db(reset=args.reset)
         logger.info("Database initialized")
         
-        # Start API server
+        # The scheduler runs in the API's lifespan, so every worker would run
+        # each scheduled pipeline against the same database, and pipeline
+        # jobs are tracked per process. Serve from one worker until the
+        # scheduler runs on its own
+        if config.api_workers > 1:
+            logger.warning(
+                f"API_WORKERS={config.api_workers} ignored: the in-process "
+                "scheduler needs a single worker"
+            )
+        
+        # Start API server; auto-reload only while developing. "auto" picks
+        # uvloop/httptools when installed and falls back to asyncio/h11
         uvicorn.run(
             "src.api.app:app",
             host=config.api_host,
             port=config.api_port,
-            reload=True
+            reload=config.debug,
+            workers=1,
+            loop="auto",
+            http="auto"
         )
     except Exception as e:
         logger.error(f"Application startup failed: {e}")
@@ -1,30 +1,69 @@
+from __future__ import annotations
+
 import streamlit as st
+import asyncio
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
 import logging
+import re
 import urllib3
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Only <input> fields and <table> blocks are read from the project page
+PARSE_TAGS = ['input', 'table']
+BIDDERS_TITLE = re.compile('รายชื่อผู้เสนอราคา')
+# Characters dropped from amounts before float(): baht sign, commas, whitespace
+_AMOUNT_STRIP = str.maketrans('', '', '฿, \t\n\r')
+
 class EGPClient:
     BASE_URL = "https://process3.gprocurement.go.th/egp2procmainWeb/procsearch.sch"
     
+    # HTML input name -> project info key
+    _FIELD_MAPPINGS = {
+        'methodName2': 'procurement_method',
+        'typeName2': 'procurement_type',
+        'govStatus2': 'project_type',
+        'projectId': 'project_id',
+        'projectName2': 'project_name',
+        'projectMoney2': 'budget',
+        'priceBuild2': 'reference_price',
+        'projectStatus2': 'project_status',
+        'deptSubName2': 'agency',
+        'moiName': 'province'
+    }
+    _NUMERIC_FIELDS = frozenset({'budget', 'reference_price'})
+    
     def __init__(self):
         self.session = requests.Session()
         self.headers = {
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9,th;q=0.8',
+            'Accept-Encoding': 'gzip, deflate',
             'Content-Type': 'application/x-www-form-urlencoded',
             'Origin': 'https://process3.gprocurement.go.th',
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0 Safari/537.36'
         }
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        ))
 
-    def get_project_details(self, project_id: str) -> Dict:
-        form_data = {
+    def _form_data(self, project_id: str) -> Dict:
+        return {
             'announceType': 'I',
             'servlet': 'FPRO9965Servlet',
             'proc_id': 'FPRO9965_2',
@@ -35,91 +74,106 @@ class EGPClient:
             'temp_projectId': project_id,
             'projectId': project_id
         }
+
+    def _parse(self, html: bytes) -> Dict:
+        """Parse a project page into project info and sorted bids"""
+        # Imported here so reruns that never fetch a project skip loading bs4
+        from bs4 import BeautifulSoup, SoupStrainer
+        
+        soup = BeautifulSoup(html, 'lxml', parse_only=SoupStrainer(PARSE_TAGS))
+        project_info = self._extract_project_info(soup)
+        bid_info = self._extract_bid_info(soup, project_info.get('reference_price', 0.0))
         
+        return {
+            'project': project_info,
+            'bids': bid_info
+        }
+
+    def get_project_details(self, project_id: str) -> Dict:
         try:
             response = self.session.post(
                 self.BASE_URL,
-                data=form_data,
-                headers=self.headers,
+                data=self._form_data(project_id),
                 verify=False,
                 timeout=30
             )
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            project_info = self._extract_project_info(soup)
-            bid_info = self._extract_bid_info(soup)
-            
-            return {
-                'project': project_info,
-                'bids': bid_info
-            }
+            return self._parse(response.content)
             
         except Exception as e:
             logger.error(f"Error getting project details: {e}")
             return {'project': {}, 'bids': []}
 
+    async def get_project_details_async(
+        self,
+        session: aiohttp.ClientSession,
+        project_id: str
+    ) -> Dict:
+        """Fetch one project on a shared aiohttp session, parsing off the event loop"""
+        try:
+            async with session.post(
+                self.BASE_URL,
+                data=self._form_data(project_id),
+                ssl=False
+            ) as response:
+                html = await response.read()
+            return await asyncio.to_thread(self._parse, html)
+            
+        except Exception as e:
+            logger.error(f"Error getting project details for {project_id}: {e}")
+            return {'project': {}, 'bids': []}
+
+    async def get_many(self, project_ids: List[str]) -> List[Dict]:
+        """Fetch several projects concurrently, results in input order"""
+        connector = aiohttp.TCPConnector(limit=16, ssl=False)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as session:
+            return await asyncio.gather(*[
+                self.get_project_details_async(session, project_id)
+                for project_id in project_ids
+            ])
+
     def _extract_project_info(self, soup: BeautifulSoup) -> Dict:
         """Extract project information from HTML using improved parser"""
-        def get_input_value(name):
-            try:
-                elem = soup.find('input', {'name': name})
-                if elem and 'value' in elem.attrs:
-                    return elem['value'].strip()
-                logger.error(f"Could not find input element: {name}")
-                return 'N/A'
-            except Exception as e:
-                logger.error(f"Error extracting {name}: {e}")
-                return 'N/A'
-
         def parse_amount(value: str) -> float:
             try:
                 if value == 'N/A':
                     return 0.0
-                # Remove currency symbol, commas, and convert to float
-                cleaned = value.replace('฿', '').replace(',', '').strip()
-                return float(cleaned)
+                return float(value.translate(_AMOUNT_STRIP))
             except (ValueError, TypeError, AttributeError) as e:
                 logger.error(f"Error parsing amount {value}: {e}")
                 return 0.0
 
         try:
-            # Define field mappings
-            field_mappings = {
-                'methodName2': 'procurement_method',
-                'typeName2': 'procurement_type',
-                'govStatus2': 'project_type',
-                'projectId': 'project_id',
-                'projectName2': 'project_name',
-                'projectMoney2': 'budget',
-                'priceBuild2': 'reference_price',
-                'projectStatus2': 'project_status',
-                'deptSubName2': 'agency',
-                'moiName': 'province'
-            }
+            # Single pass over the inputs; first occurrence of a name wins
+            raw_values = {}
+            for elem in soup.find_all('input', attrs={'name': True, 'value': True}):
+                field = self._FIELD_MAPPINGS.get(elem['name'])
+                if field and field not in raw_values:
+                    raw_values[field] = elem['value'].strip()
 
-            # Extract all values first
-            raw_values = {
-                field: get_input_value(html_field)
-                for html_field, field in field_mappings.items()
-            }
+            missing = [
+                html_field for html_field, field in self._FIELD_MAPPINGS.items()
+                if field not in raw_values
+            ]
+            if missing:
+                logger.error(f"Could not find input elements: {', '.join(missing)}")
+                for html_field in missing:
+                    raw_values[self._FIELD_MAPPINGS[html_field]] = 'N/A'
 
-            # Log raw values for debugging
-            logger.info("Raw input values:")
-            for field, value in raw_values.items():
-                logger.info(f"{field}: {value}")
+            logger.debug("Raw input values: %r", raw_values)
 
             info = {
                 'title': 'ข้อมูลสาระสำคัญในสัญญา',
-                **raw_values,
-                'budget': parse_amount(raw_values['budget']),
-                'reference_price': parse_amount(raw_values['reference_price'])
+                **raw_values
             }
+            for field in self._NUMERIC_FIELDS:
+                info[field] = parse_amount(info[field])
             
-            # Log processed values
-            logger.info("Processed project info:")
-            for key, value in info.items():
-                logger.info(f"{key}: {value}")
-                
+            logger.debug("Processed project info: %r", info)
+
             return info
             
         except Exception as e:
@@ -128,13 +182,14 @@ class EGPClient:
         
         return info
 
-    def _extract_bid_info(self, soup: BeautifulSoup) -> List[Dict]:
+    def _extract_bid_info(self, soup: BeautifulSoup, reference_price: float) -> List[Dict]:
         """Extract bid information using improved parser"""
         try:
             # Find the table that contains bidder information
             bidders_table = None
-            for table in soup.find_all('table'):
-                if table.find('td', string=lambda t: t and 'รายชื่อผู้เสนอราคา' in t):
+            for text in soup.find_all(string=BIDDERS_TITLE):
+                table = text.find_parent('table')
+                if table and table.find('tr', class_='tr0'):
                     bidders_table = table
                     break
 
@@ -153,34 +208,38 @@ class EGPClient:
                 logger.warning(f"Insufficient cells in bid row: {len(cells)}")
                 return []
 
-            # Get lists by splitting on <br> tags
-            tax_ids = [x.strip() for x in cells[2].get_text('<br>').split('<br>') if x.strip()]
-            bidder_names = [x.strip() for x in cells[3].get_text('<br>').split('<br>') if x.strip()]
-            prices = [x.strip() for x in cells[4].get_text('<br>').split('<br>') if x.strip()]
+            # Each <br>-separated entry is its own text node
+            tax_ids = list(cells[2].stripped_strings)
+            bidder_names = list(cells[3].stripped_strings)
+            prices = list(cells[4].stripped_strings)
 
-            bids = []
-            reference_price = self._extract_project_info(soup)['reference_price']
-            
-            # Add debug logging
-            logger.info(f"Found {len(tax_ids)} bids")
-            logger.info(f"Reference price: {reference_price}")
+            logger.debug("Found %d bids (reference price: %s)", len(tax_ids), reference_price)
             
         except Exception as e:
             logger.error(f"Error extracting bid info: {e}")
             return []
         
-        for tax_id, company, amount in zip(tax_ids, bidder_names, prices):
-            bid_amount = float(amount.replace(',', ''))
-            price_cut = ((bid_amount / reference_price) - 1) * 100 if reference_price else 0
-            
-            bids.append({
-                'tax_id': tax_id,
-                'company': company,
-                'bid_amount': bid_amount,
-                'price_cut': price_cut
-            })
+        count = min(len(tax_ids), len(bidder_names), len(prices))
+        amounts = np.array([float(amount.translate(_AMOUNT_STRIP)) for amount in prices[:count]], dtype=np.float64)
+        if reference_price:
+            price_cuts = (amounts / reference_price - 1.0) * 100.0
+        else:
+            price_cuts = np.zeros(count)
+
+        # Lowest bid first; stable so ties keep their page order
+        order = np.argsort(amounts, kind='stable')
+        bid_amounts = amounts.tolist()
+        cuts = price_cuts.tolist()
 
-        return sorted(bids, key=lambda x: x['bid_amount'])
+        return [
+            {
+                'tax_id': tax_ids[i],
+                'company': bidder_names[i],
+                'bid_amount': bid_amounts[i],
+                'price_cut': cuts[i]
+            }
+            for i in order.tolist()
+        ]
 
 def format_currency(value: float) -> str:
     return f"฿{value:,.2f}"
@@ -188,12 +247,27 @@ def format_currency(value: float) -> str:
 def format_percentage(value: float) -> str:
     return f"{value:.1f}%"
 
+@st.cache_resource
+def get_client() -> EGPClient:
+    """Shared client so the pooled session survives Streamlit reruns"""
+    return EGPClient()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_project_details(project_id: str) -> Dict:
+    """Fetch and parse a project once per hour instead of on every rerun
+    
+    Raises LookupError when the lookup fails; Streamlit doesn't cache
+    exceptions, so a failed project is fetched again next time.
+    """
+    result = get_client().get_project_details(project_id)
+    if not result['project']:
+        raise LookupError(project_id)
+    return result
+
 def main():
     st.set_page_config(page_title="EGP Project Explorer", layout="wide")
     st.title("🏛️ EGP Project Explorer")
     
-    client = EGPClient()
-    
     project_id = st.text_input(
         "Enter Project ID",
         help="Enter the 11-digit project ID from EGP system",
@@ -202,7 +276,10 @@ def main():
     
     if st.button("🔍 Get Project Details", type="primary", use_container_width=True):
         with st.spinner("Fetching project details..."):
-            result = client.get_project_details(project_id)
+            try:
+                result = fetch_project_details(project_id)
+            except LookupError:
+                result = {'project': {}, 'bids': []}
             
             if result['project']:
                 # Project Info Section
@@ -276,7 +353,13 @@ def main():
                         delta_color="inverse"
                     )
                     
-                    avg_bid = sum(b['bid_amount'] for b in result['bids']) / len(result['bids'])
+                    bids = result['bids']
+                    amounts = np.fromiter(
+                        (b['bid_amount'] for b in bids),
+                        dtype=np.float64,
+                        count=len(bids)
+                    )
+                    avg_bid = float(amounts.mean())
                     col3.metric(
                         "Average Bid",
                         format_currency(avg_bid)
@@ -284,12 +367,14 @@ def main():
                     
                     # Bid Table
                     st.header("📊 All Bids")
-                    df = pd.DataFrame(result['bids'])
-                    df['bid_amount'] = df['bid_amount'].map(format_currency) 
-                    df['price_cut'] = df['price_cut'].map(format_percentage)
+                    df = pd.DataFrame(bids)
                     
+                    # Format at render time so the numeric columns stay sortable
                     st.dataframe(
-                        df,
+                        df.style.format({
+                            'bid_amount': format_currency,
+                            'price_cut': format_percentage
+                        }),
                         column_config={
                             "tax_id": "Tax ID",
                             "company": "Company",
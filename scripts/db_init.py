@@ -13,13 +13,21 @@ def init_db():
         
         # Connect to database
         conn = sqlite3.connect(config.db_path)
-        cursor = conn.cursor()
         
-        # Drop existing tables
-        cursor.execute("DROP TABLE IF EXISTS announcements")
+        # Cheap journaling for bulk schema work
+        conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        """)
+        
+        # Recreate table and indices in a single transaction
+        conn.executescript("""
+        BEGIN;
+        
+        DROP TABLE IF EXISTS announcements;
+        DROP TABLE IF EXISTS daily_stats;
         
-        # Create announcements table
-        cursor.execute("""
         CREATE TABLE announcements (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             project_id TEXT NOT NULL UNIQUE,
@@ -30,23 +38,13 @@ def init_db():
             status TEXT NOT NULL DEFAULT 'pending',
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        """)
+        );
         
-        # Create indices
-        cursor.execute("""
-        CREATE INDEX idx_project_id 
-        ON announcements(project_id)
-        """)
-        
-        cursor.execute("""
-        CREATE INDEX idx_dept_id 
-        ON announcements(dept_id)
-        """)
+        CREATE INDEX idx_dept_id ON announcements(dept_id);
+        CREATE INDEX idx_ann_status_created ON announcements(status, created_at);
+        CREATE INDEX idx_ann_created ON announcements(created_at);
         
-        cursor.execute("""
-        CREATE INDEX idx_status 
-        ON announcements(status)
+        COMMIT;
         """)
         
         conn.commit()
@@ -15,28 +15,24 @@ def clear_database():
     """Clear all data from the database"""
     try:
         with get_db() as conn:
-            cursor = conn.cursor()
-            
             # Get table names
-            cursor.execute("""
+            tables = conn.execute("""
                 SELECT name 
                 FROM sqlite_master 
                 WHERE type='table' AND name != 'sqlite_sequence'
-            """)
-            
-            tables = cursor.fetchall()
+            """).fetchall()
             
-            # Delete data from each table
-            for table in tables:
-                table_name = table['name']
-                try:
-                    cursor.execute(f"DELETE FROM {table_name}")
-                    cursor.execute(f"DELETE FROM sqlite_sequence WHERE name=?", (table_name,))
-                    logger.info(f"Cleared table: {table_name}")
-                except sqlite3.Error as e:
-                    logger.error(f"Error clearing table {table_name}: {e}")
+            # Clear every table in one write transaction, committed on exit
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                for (table_name,) in tables:
+                    try:
+                        conn.execute(f'DELETE FROM "{table_name}"')
+                        conn.execute(f"DELETE FROM sqlite_sequence WHERE name=?", (table_name,))
+                        logger.info(f"Cleared table: {table_name}")
+                    except sqlite3.Error as e:
+                        logger.error(f"Error clearing table {table_name}: {e}")
             
-            conn.commit()
             logger.info("Database cleared successfully")
             
     except Exception as e:
@@ -17,10 +17,11 @@ def qwen_table():
     """Create table for AI-analyzed PDF content"""
     try:
         with sqlite3.connect(config.db_path) as conn:
-            cursor = conn.cursor()
+            # SQLite only enforces the declared foreign key when asked to
+            conn.execute("PRAGMA foreign_keys=ON")
             
             # Create table for AI analysis results
-            cursor.execute("""
+            conn.execute("""
                 CREATE TABLE IF NOT EXISTS projects_qwen (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     project_id TEXT UNIQUE NOT NULL,
@@ -38,13 +39,14 @@ def qwen_table():
                 )
             """)
             
-            # Add indices
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_ai_analysis_project_id 
-                ON ai_pdf_analysis (project_id)
+            # project_id is already indexed by its UNIQUE constraint; this
+            # covers lookups that also read budget and announcement date
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_qwen_project_budget
+                ON projects_qwen (project_id, budget_amount, announcement_date)
             """)
             
-            conn.commit()
+            # The connection's with block commits on exit
             logger.info("AI analysis table created successfully")
             
     except Exception as e:
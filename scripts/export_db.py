@@ -5,6 +5,9 @@ from pathlib import Path
 import logging
 from datetime import datetime
 
+# Rows fetched per round-trip while exporting
+BATCH_SIZE = 10_000
+
 def setup_logging():
     """Configure logging"""
     logging.basicConfig(
@@ -18,28 +21,27 @@ def setup_logging():
 
 def export_table_to_csv(conn, table_name, output_dir):
     """Export a single table to CSV"""
-    cursor = conn.cursor()
-    
     # Get column names
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = [col[1] for col in cursor.fetchall()]
+    columns = [col[1] for col in conn.execute(f"PRAGMA table_info({table_name})")]
     
-    # Get all data from the table
-    cursor.execute(f"SELECT * FROM {table_name}")
-    rows = cursor.fetchall()
+    # Stream rows from the table in batches
+    cursor = conn.execute(f"SELECT * FROM {table_name}")
     
     # Generate filename with timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = output_dir / f"{table_name}_{timestamp}.csv"
     
     # Write to CSV
-    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+    row_count = 0
+    with open(output_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
         writer = csv.writer(f)
         writer.writerow(columns)  # Write header
-        writer.writerows(rows)    # Write data
+        for batch in iter(lambda: cursor.fetchmany(BATCH_SIZE), []):
+            writer.writerows(batch)
+            row_count += len(batch)
         
-    logging.info(f"Exported {len(rows)} rows from {table_name} to {output_file}")
-    return len(rows)
+    logging.info(f"Exported {row_count} rows from {table_name} to {output_file}")
+    return row_count
 
 def main():
     """Main function to export all tables to CSV"""
@@ -54,12 +56,9 @@ def main():
         
         # Connect to database
         conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
         
         # Get list of tables
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        tables = [row[0] for row in cursor.fetchall()]
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
         
         total_rows = 0
         for table in tables:
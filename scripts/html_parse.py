@@ -1,39 +1,101 @@
 from bs4 import BeautifulSoup
+from html.parser import HTMLParser
 import re
 
+# Drops existing thousands separators before float()
+_STRIP_COMMAS = str.maketrans('', '', ',')
+
 def format_currency(value):
     """Format currency string to proper format with commas"""
     try:
         # Remove any existing commas and convert to float
-        num = float(value.replace(',', ''))
+        num = float(value.translate(_STRIP_COMMAS))
         # Format with 2 decimal places and add commas
         return f"{num:,.2f}"
     except:
         return value
 
-def print_header(soup):
+# Opening and closing table tags, for slicing a single table out of the page
+TABLE_TAG = re.compile(r'<(/?)table\b', re.IGNORECASE)
+
+# Input names shown in the header
+HEADER_FIELDS = frozenset({
+    'deptSubName2', 'moiName', 'methodName2', 'typeName2', 'govStatus2',
+    'projectId', 'projectName2', 'projectMoney2', 'priceBuild2', 'projectStatus2'
+})
+
+class HeaderFieldParser(HTMLParser):
+    """Collect the values of the header inputs without building a tree"""
+    def __init__(self):
+        super().__init__()
+        self.values = {}
+
+    @property
+    def done(self):
+        return len(self.values) == len(HEADER_FIELDS)
+
+    def handle_starttag(self, tag, attrs):
+        if tag != 'input':
+            return
+        attrs = dict(attrs)
+        name = attrs.get('name')
+        # First occurrence of a name wins
+        if name in HEADER_FIELDS and name not in self.values:
+            self.values[name] = attrs.get('value')
+
+def read_header_fields(html_content, chunk_size=16384):
+    """Stream the page until every header input has been seen"""
+    parser = HeaderFieldParser()
+    for start in range(0, len(html_content), chunk_size):
+        parser.feed(html_content[start:start + chunk_size])
+        if parser.done:
+            break
+    return parser.values
+
+def print_header(html_content):
     """Print the header section with project details"""
+    inputs = read_header_fields(html_content)
+    
     print("ข้อมูลสาระสำคัญในสัญญา")
-    print(f"{'หน่วยงาน':<15} {soup.find('input', {'name': 'deptSubName2'})['value']}")
-    print(f"{'จังหวัด':<15} {soup.find('input', {'name': 'moiName'})['value']}")
-    print(f"{'วิธีการจัดหา':<15} {soup.find('input', {'name': 'methodName2'})['value']}")
-    print(f"{'ประเภทการจัดหา':<15} {soup.find('input', {'name': 'typeName2'})['value']}")
-    print(f"{'ประเภทโครงการ':<15} {soup.find('input', {'name': 'govStatus2'})['value']}")
-    print(f"{'เลขที่โครงการ':<15} {soup.find('input', {'name': 'projectId'})['value']}")
-    print(f"{'ชื่อโครงการ':<15} {soup.find('input', {'name': 'projectName2'})['value']}")
+    print(f"{'หน่วยงาน':<15} {inputs['deptSubName2']}")
+    print(f"{'จังหวัด':<15} {inputs['moiName']}")
+    print(f"{'วิธีการจัดหา':<15} {inputs['methodName2']}")
+    print(f"{'ประเภทการจัดหา':<15} {inputs['typeName2']}")
+    print(f"{'ประเภทโครงการ':<15} {inputs['govStatus2']}")
+    print(f"{'เลขที่โครงการ':<15} {inputs['projectId']}")
+    print(f"{'ชื่อโครงการ':<15} {inputs['projectName2']}")
     
-    budget = format_currency(soup.find('input', {'name': 'projectMoney2'})['value'])
-    price = format_currency(soup.find('input', {'name': 'priceBuild2'})['value'])
+    budget = format_currency(inputs['projectMoney2'])
+    price = format_currency(inputs['priceBuild2'])
     
     print(f"{'งบประมาณ':<15} {budget} บาท")
     print(f"{'ราคากลาง':<15} {price} บาท")
-    print(f"{'สถานะโครงการ':<15} {soup.find('input', {'name': 'projectStatus2'})['value']}")
+    print(f"{'สถานะโครงการ':<15} {inputs['projectStatus2']}")
     print("\nรายชื่อผู้เสนอราคา")
 
-def print_bidders_table(soup):
+def slice_table(html_content, index):
+    """Return the markup of the index-th <table> (document order, nested included)"""
+    count = -1
+    start = None
+    depth = 0
+    for match in TABLE_TAG.finditer(html_content):
+        if not match.group(1):
+            count += 1
+            if count == index:
+                start = match.start()
+            if start is not None:
+                depth += 1
+        elif start is not None:
+            depth -= 1
+            if depth == 0:
+                return html_content[start:html_content.index('>', match.end()) + 1]
+    return html_content[start:] if start is not None else None
+
+def print_bidders_table(html_content):
     """Print the bidders table"""
-    # Find the table with bidder information
-    bidders_table = soup.find_all('table')[6]  # Adjust index based on your HTML structure
+    # Find the table with bidder information; only that fragment is parsed
+    fragment = slice_table(html_content, 6)  # Adjust index based on your HTML structure
+    bidders_table = BeautifulSoup(fragment, 'lxml')
     
     # Print table headers
     headers = ["เลขประจำตัวผู้เสียภาษีอากร", "รายชื่อผู้เสนอราคา", "ราคาที่เสนอ"]
@@ -45,26 +107,29 @@ def print_bidders_table(soup):
     if data_row:
         cells = data_row.find_all('td')
         
-        # Get lists by splitting on <br> tags
-        tax_ids = [x.strip() for x in cells[2].get_text('<br>').split('<br>') if x.strip()]
-        bidder_names = [x.strip() for x in cells[3].get_text('<br>').split('<br>') if x.strip()]
-        prices = [x.strip() for x in cells[4].get_text('<br>').split('<br>') if x.strip()]
+        # Each <br>-separated entry is its own text node
+        tax_ids = list(cells[2].stripped_strings)
+        bidder_names = list(cells[3].stripped_strings)
+        prices = list(cells[4].stripped_strings)
+        
+        # Format prices inline; only a non-numeric price pays for the per-value fallback
+        try:
+            prices = [f"{float(p.translate(_STRIP_COMMAS)):,.2f}" for p in prices]
+        except ValueError:
+            prices = [format_currency(p) for p in prices]
         
         # Print all rows
         for i in range(len(tax_ids)):
-            print(f"{tax_ids[i]:<25} {bidder_names[i]:<40} {format_currency(prices[i])}")
+            print(f"{tax_ids[i]:<25} {bidder_names[i]:<40} {prices[i]}")
 
 def main():
     # Read the HTML file
     with open('html_response.txt', 'r', encoding='utf-8') as file:
         html_content = file.read()
 
-    # Parse HTML
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
     # Print formatted output
-    print_header(soup)
-    print_bidders_table(soup)
+    print_header(html_content)
+    print_bidders_table(html_content)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,6 +1,6 @@
 # Migration script (scripts/migrate_pdfs.py)
 import asyncio
-import shutil
+import os
 from pathlib import Path
 import sys
 from typing import List, Tuple
@@ -54,15 +54,16 @@ def migrate_pdfs() -> None:
                     )
                     continue
                 
-                # Move the file
-                shutil.move(old_path, new_path)
+                # Move the file; same parent filesystem, so a plain rename suffices
+                os.replace(old_path, new_path)
                 logger.info(f"Moved PDF for project {project_id}")
                 
-                # Remove empty project directory
-                project_dir = old_path.parent
-                if not any(project_dir.iterdir()):
-                    project_dir.rmdir()
+                # Remove project directory; rmdir itself fails if it isn't empty
+                try:
+                    old_path.parent.rmdir()
                     logger.info(f"Removed empty directory for project {project_id}")
+                except OSError:
+                    pass
                     
             except Exception as e:
                 logger.error(f"Error migrating PDF for project {project_id}: {e}")
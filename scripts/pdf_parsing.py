@@ -1,12 +1,17 @@
 # scripts/analyze_pdfs.py
 
 import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
 import json
+import orjson
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any
-import PyPDF2
-from openai import OpenAI
+from typing import Optional, Dict, Any, List, Tuple
+import fitz  # PyMuPDF
+import httpx
+from openai import AsyncOpenAI, RateLimitError
 import os
 import sys
 from dotenv import load_dotenv
@@ -52,17 +57,36 @@ load_dotenv()
 # Initialize logging
 logger = setup_logging()
 
+# Keep-alive pool shared by all API calls; HTTP/2 multiplexes concurrent
+# requests over one connection instead of a TLS handshake each
+http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
+    timeout=60.0
+)
+
 # Initialize OpenAI client
-client = OpenAI(
+client = AsyncOpenAI(
         api_key=os.getenv('OPENAI_API_KEY'), 
-        base_url="https://dashscope-intl.aliyuncs.com/compatible-mode/v1"
+        base_url="https://dashscope-intl.aliyuncs.com/compatible-mode/v1",
+        http_client=http_client
     )
 
-# The prompt template for GPT
-ANALYSIS_PROMPT = """
-Your task is to analyze project announcements and return it in a structured JSON format.
+# Concurrent API calls allowed while processing a directory
+MAX_CONCURRENCY = 16
 
-Please extract the following information if available:
+# PDFs sent together in one API call when processing a directory
+BATCH_SIZE = 8
+
+# Retries on rate limiting, with exponential backoff from RETRY_BASE_DELAY
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 1.0  # seconds
+
+SYSTEM_PROMPT = "You are a procurement document analyzer. Always respond with valid JSON only."
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
+# Fields requested for every document
+ANALYSIS_FIELDS = """
 - document_title: title of the pdf document (in Thai)
 - เรื่อง: long project title (in Thai)
 - department_name: Name of the department (in Thai)
@@ -72,125 +96,241 @@ Please extract the following information if available:
 - contact:
 -- phone: (Arabic integers)
 -- email: (String)
+"""
+
+# The prompt template for GPT
+ANALYSIS_PROMPT = """
+Your task is to analyze project announcements and return it in a structured JSON format.
 
+Please extract the following information if available:
+""" + ANALYSIS_FIELDS + """
 Return only the JSON object with these fields. If a field is not found, set it to null.
 Here's the document text:
 
 {text}
 """
+# Split once so each call only concatenates the document text
+ANALYSIS_PROMPT_PREFIX, ANALYSIS_PROMPT_SUFFIX = ANALYSIS_PROMPT.split("{text}")
+
+# Prompt template for several documents in one call
+BATCH_ANALYSIS_PROMPT = """
+Your task is to analyze {count} project announcements and return them in a structured JSON format.
+
+Please extract the following information from each document if available:
+""" + ANALYSIS_FIELDS + """
+Return only a JSON object of the form {{"results": [...]}} with exactly one entry per
+document, in the same order as the documents. If a field is not found, set it to null.
+Each document starts with a line of the form ===DOC n===. Here are the documents:
+
+{documents}
+"""
+
+# Extracted text (<hash>.txt) and analysis results (<hash>.json), keyed by
+# a hash of the PDF's bytes so unchanged files are never re-parsed
+CACHE_DIR = Path("cache")
+
+def file_digest(pdf_path: Path) -> str:
+    """Content hash of a file, used as its cache key."""
+    return hashlib.blake2b(pdf_path.read_bytes(), digest_size=16).hexdigest()
 
-def extract_text_from_pdf(pdf_path: Path) -> Optional[str]:
-    """Extract text content from a PDF file."""
+def extract_text_from_pdf(pdf_path: Path, digest: Optional[str] = None) -> Optional[str]:
+    """Extract text content from a PDF file, reusing the cached text if present."""
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ''
-            for page in reader.pages:
-                text += page.extract_text()
-            return text
+        cache_file = CACHE_DIR / f"{digest or file_digest(pdf_path)}.txt"
+        if cache_file.exists():
+            return cache_file.read_text(encoding='utf-8')
+
+        with fitz.open(pdf_path) as doc:
+            text = ''.join(page.get_text() for page in doc)
     except Exception as e:
         logger.error(f"Error extracting text from {pdf_path}: {e}")
         return None
 
-def analyze_text_with_gpt(text: str) -> Optional[Dict[str, Any]]:
-    """Send text to OpenAI API and get structured response."""
+    if text:
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            cache_file.write_text(text, encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"Could not cache text for {pdf_path}: {e}")
+    return text
+
+def load_cached_result(digest: str) -> Optional[Dict[str, Any]]:
+    """Analysis result cached for a PDF's content hash, if any."""
     try:
-        # Prepare the prompt
-        prompt = ANALYSIS_PROMPT.format(text=text)
-        
-        # Call OpenAI API
-        response = client.chat.completions.create(
-            model="qwen-turbo", 
-            messages=[
-                {"role": "system", "content": "You are a procurement document analyzer. Always respond with valid JSON only."},
-                {"role": "user", "content": prompt}
-            ],
-            response_format={"type": "json_object"}  # Enforce JSON response
-        )
-        
-        # Parse the response
-        response_text = response.choices[0].message.content
-        return json.loads(response_text)
-        
-    except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse JSON response: {e}")
-        logger.error(f"Raw response: {response_text}")
-        return None
-    except Exception as e:
-        logger.error(f"Error calling OpenAI API: {e}")
+        return orjson.loads((CACHE_DIR / f"{digest}.json").read_bytes())
+    except (OSError, orjson.JSONDecodeError):
         return None
 
-def process_pdf(pdf_path: Path) -> None:
-    """Process a single PDF file."""
-    project_id = pdf_path.stem
-    
-    # Extract text
-    text = extract_text_from_pdf(pdf_path)
-    if not text:
-        logger.error(f"{project_id}.pdf: Failed to extract text")
+def cache_result(digest: str, result: Dict[str, Any]) -> None:
+    """Cache an analysis result under the PDF's content hash."""
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        (CACHE_DIR / f"{digest}.json").write_bytes(orjson.dumps(result))
+    except OSError as e:
+        logger.warning(f"Could not cache result {digest}: {e}")
+
+async def request_json(prompt: str) -> Optional[Dict[str, Any]]:
+    """Send a prompt to the OpenAI API and parse the JSON reply, retrying on rate limits."""
+    response_text = None
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            # Call OpenAI API
+            response = await client.chat.completions.create(
+                model="qwen-turbo",
+                messages=[SYSTEM_MESSAGE, {"role": "user", "content": prompt}],
+                response_format={"type": "json_object"}  # Enforce JSON response
+            )
+
+            # Parse the response
+            response_text = response.choices[0].message.content
+            return orjson.loads(response_text)
+
+        except RateLimitError:
+            delay = RETRY_BASE_DELAY * (2 ** attempt)
+            logger.warning(f"Rate limited, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON response: {e}")
+            logger.error(f"Raw response: {response_text}")
+            return None
+        except Exception as e:
+            logger.error(f"Error calling OpenAI API: {e}")
+            return None
+
+    logger.error(f"Still rate limited after {MAX_RETRIES} attempts")
+    return None
+
+async def analyze_text_with_gpt(text: str) -> Optional[Dict[str, Any]]:
+    """Send text to OpenAI API and get structured response."""
+    return await request_json(ANALYSIS_PROMPT_PREFIX + text + ANALYSIS_PROMPT_SUFFIX)
+
+async def analyze_batch(texts: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """Analyze several documents in one API call, one result per text in order."""
+    if len(texts) == 1:
+        return [await analyze_text_with_gpt(texts[0])]
+
+    documents = "\n".join(
+        f"===DOC {i}===\n{text}"
+        for i, text in enumerate(texts, 1)
+    )
+    response = await request_json(
+        BATCH_ANALYSIS_PROMPT.format(count=len(texts), documents=documents)
+    )
+    results = response.get("results") if isinstance(response, dict) else None
+
+    if isinstance(results, list) and len(results) == len(texts):
+        return results
+
+    # The model didn't return one entry per document; fall back to single calls
+    logger.warning(f"Batch response did not match {len(texts)} documents, analyzing individually")
+    return await asyncio.gather(*[analyze_text_with_gpt(text) for text in texts])
+
+def extract_stage(pdf_path: Path) -> Tuple[str, Optional[str], Optional[str]]:
+    """Extraction stage: (project_id, content hash, text). Runs in a worker process."""
+    try:
+        digest = file_digest(pdf_path)
+    except OSError as e:
+        logger.error(f"Error reading {pdf_path}: {e}")
+        return pdf_path.stem, None, None
+    return pdf_path.stem, digest, extract_text_from_pdf(pdf_path, digest)
+
+async def analyze_stage(extracted: List[Tuple[str, Optional[str], Optional[str]]]) -> None:
+    """Analysis stage: send extracted texts in one API call and save the results."""
+    ready = []
+    for project_id, digest, text in extracted:
+        if not text:
+            logger.error(f"{project_id}.pdf: Failed to extract text")
+            continue
+
+        # Unchanged file that was already analyzed
+        cached = load_cached_result(digest)
+        if cached is not None:
+            save_result(project_id, cached)
+            logger.info(f"{project_id}.pdf: Parsed successfully (cached)")
+            continue
+
+        ready.append((project_id, digest, text))
+
+    if not ready:
         return
-    
+
     # Analyze with GPT
-    result = analyze_text_with_gpt(text)
-    if not result:
-        logger.error(f"{project_id}.pdf: Failed to analyze text")
-        return
-    
-    # Save result
-    save_result(project_id, result)
-    logger.info(f"{project_id}.pdf: Parsed successfully")
+    results = await analyze_batch([text for _, _, text in ready])
+
+    for (project_id, digest, _), result in zip(ready, results):
+        if not result:
+            logger.error(f"{project_id}.pdf: Failed to analyze text")
+            continue
+
+        # Save result
+        cache_result(digest, result)
+        save_result(project_id, result)
+        logger.info(f"{project_id}.pdf: Parsed successfully")
+
+async def process_pdf(pdf_path: Path) -> None:
+    """Process a single PDF file."""
+    extracted = await asyncio.to_thread(extract_stage, pdf_path)
+    await analyze_stage([extracted])
+
+async def process_directory(directory: Path, batch_size: int = BATCH_SIZE) -> None:
+    """Process all PDF files in a directory, batch_size files per API call.
 
-def process_directory(directory: Path) -> None:
-    """Process all PDF files in a directory."""
+    Text extraction runs across CPU cores in a process pool; each batch is
+    sent for analysis as soon as its own files are extracted, so API calls
+    overlap with the remaining extraction work.
+    """
     pdf_files = list(directory.glob('*.pdf'))
     total = len(pdf_files)
     logger.info(f"Found {total} PDF files")
-    
-    for i, pdf_path in enumerate(pdf_files, 1):
-        logger.info(f"Processing file {i}/{total}")
-        process_pdf(pdf_path)
 
-RESULTS_FILE = "pdf_analysis_results.json"
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
 
-def load_existing_results() -> Dict[str, Any]:
-    """Load existing results from JSON file"""
-    try:
-        if Path(RESULTS_FILE).exists():
-            with open(RESULTS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-    except Exception as e:
-        logger.error(f"Error loading existing results: {e}")
-    return {}
+    with ProcessPoolExecutor() as executor:
+        extractions = [
+            loop.run_in_executor(executor, extract_stage, pdf_path)
+            for pdf_path in pdf_files
+        ]
+        batches = [
+            extractions[i:i + batch_size]
+            for i in range(0, total, batch_size)
+        ]
+
+        async def process_limited(i: int, batch: List[asyncio.Future]) -> None:
+            extracted = await asyncio.gather(*batch)
+            async with semaphore:
+                logger.info(f"Analyzing batch {i}/{len(batches)} ({len(batch)} files)")
+                await analyze_stage(extracted)
+
+        await asyncio.gather(*[
+            process_limited(i, batch)
+            for i, batch in enumerate(batches, 1)
+        ])
+
+# One JSON record per line; a later record for a project supersedes earlier ones
+RESULTS_FILE = "pdf_analysis_results.jsonl"
 
 def save_result(project_id: str, result: Dict[str, Any]) -> None:
-    """Save result to JSON file"""
+    """Append result to the JSONL results file"""
+    record = {
+        "project_id": project_id,
+        "data": result,
+        "parsed_at": datetime.now().isoformat()
+    }
+    
     try:
-        # Load existing results
-        results = load_existing_results()
-        
-        # Add new result with timestamp
-        results[project_id] = {
-            "data": result,
-            "parsed_at": datetime.now().isoformat()
-        }
-        
-        # Write to temporary file first
-        temp_file = f"{RESULTS_FILE}.tmp"
-        with open(temp_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-        
-        # Rename temporary file to actual file (atomic operation)
-        os.replace(temp_file, RESULTS_FILE)
-        
+        with open(RESULTS_FILE, 'ab') as f:
+            f.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
     except Exception as e:
         logger.error(f"Error saving results: {e}")
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
 
 def main():
     """Main entry point for the script."""
     parser = argparse.ArgumentParser(description='Analyze procurement PDFs using OpenAI')
     parser.add_argument('path', type=str, help='Path to PDF file or directory')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                        help=f'PDFs analyzed per API call (default: {BATCH_SIZE})')
     args = parser.parse_args()
 
     if not os.getenv('OPENAI_API_KEY'):
@@ -207,9 +347,9 @@ def main():
         if path.suffix.lower() != '.pdf':
             logger.error(f"Not a PDF file: {path}")
             return
-        process_pdf(path)
+        asyncio.run(process_pdf(path))
     elif path.is_dir():
-        process_directory(path)
+        asyncio.run(process_directory(path, args.batch_size))
     else:
         logger.error(f"Invalid path type: {path}")
 
@@ -1,6 +1,9 @@
 import streamlit as st
-import pandas as pd
-from bs4 import BeautifulSoup
+import pyarrow as pa
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Only inputs, the title spans and tables are read; the rest of the page isn't built
+PARSE_ONLY = SoupStrainer(['input', 'table', 'span'])
 
 def decode_file_content(uploaded_file):
     """
@@ -31,12 +34,10 @@ def parse_bidders_details(soup):
         st.warning("Could not find bidders title")
         return []
     
-    # Find the next table after the title
-    current = title_span
-    while current and current.name != 'table':
-        current = current.find_next_sibling()
+    # First table after the title in document order (XPath following::table[1])
+    current = title_span.find_next('table')
     
-    if not current or current.name != 'table':
+    if not current:
         st.warning("Could not find bidders table")
         return []
     
@@ -53,9 +54,9 @@ def parse_bidders_details(soup):
         return []
 
     # Extract tax IDs, company names, and prices
-    tax_ids = [id.strip() for id in cols[2].get_text(strip=True, separator='\n').split('\n') if id.strip()]
-    companies = [name.strip() for name in cols[3].get_text(strip=True, separator='\n').split('\n') if name.strip()]
-    prices = [price.strip() for price in cols[4].get_text(strip=True, separator='\n').split('\n') if price.strip()]
+    tax_ids = list(cols[2].stripped_strings)
+    companies = list(cols[3].stripped_strings)
+    prices = list(cols[4].stripped_strings)
 
     # Create bidders list
     bidders = []
@@ -86,10 +87,14 @@ def parse_project_details(soup):
         ('ราคากลาง', 'priceBuild2')
     ]
 
+    # Index named inputs in one pass; first occurrence of a name wins
+    inputs = {}
+    for input_elem in soup.find_all('input', attrs={'name': True}):
+        inputs.setdefault(input_elem['name'], input_elem.get('value', ''))
+
     for label, input_name in detail_mappings:
-        input_elem = soup.find('input', {'name': input_name})
-        if input_elem:
-            project_details[label] = input_elem.get('value', '').strip()
+        if input_name in inputs:
+            project_details[label] = inputs[input_name].strip()
 
     return project_details
 
@@ -123,7 +128,7 @@ def parse_procurement_document(file_content):
     Main parsing function for the procurement document
     """
     # Parse the HTML content
-    soup = BeautifulSoup(file_content, 'html.parser')
+    soup = BeautifulSoup(file_content, 'lxml', parse_only=PARSE_ONLY)
 
     # Extract project details
     project_details = parse_project_details(soup)
@@ -177,16 +182,17 @@ def main():
             # Display Contract Details
             st.header('รายละเอียดสัญญา')
             if contract_details:
-                contract_df = pd.DataFrame(contract_details)
-                st.dataframe(contract_df, use_container_width=True)
+                # Records go straight to Arrow, which is what Streamlit sends anyway
+                contract_table = pa.Table.from_pylist(contract_details)
+                st.dataframe(contract_table, use_container_width=True)
             else:
                 st.write("No contract details found.")
             
             # Display Bidders Details
             st.header('รายชื่อผู้เสนอราคา')
             if bidder_details:
-                bidder_df = pd.DataFrame(bidder_details)
-                st.dataframe(bidder_df, use_container_width=True)
+                bidder_table = pa.Table.from_pylist(bidder_details)
+                st.dataframe(bidder_table, use_container_width=True)
             else:
                 st.write("No bidders found.")
         
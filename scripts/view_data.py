@@ -3,6 +3,8 @@
 import sys
 from pathlib import Path
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import sqlite3
 import argparse
 
@@ -33,17 +35,21 @@ def view_announcements(limit: int = 20):
             LIMIT ?
             """
             
-            # Read into pandas DataFrame
-            df = pd.read_sql_query(query, conn, params=(limit,))
+            # Read into an Arrow-backed DataFrame (no Python object per cell)
+            df = pd.read_sql_query(query, conn, params=(limit,), dtype_backend='pyarrow')
             
             if df.empty:
                 logger.info("No announcements found in database!")
                 return
             
-            # Format datetime columns
+            # Format datetime columns with Arrow compute instead of per-row strftime
             for col in ['created_at', 'updated_at']:
-                df[col] = pd.to_datetime(df[col])
-                df[col] = df[col].dt.strftime('%Y-%m-%d %H:%M:%S')
+                timestamps = pa.array(pd.to_datetime(df[col]))
+                # Whole seconds, or %S would print the fraction too
+                timestamps = pc.cast(timestamps, pa.timestamp('s'), safe=False)
+                df[col] = pd.arrays.ArrowExtensionArray(
+                    pc.strftime(timestamps, format='%Y-%m-%d %H:%M:%S')
+                )
             
             # Limit title length for display
             df['title'] = df['title'].str.slice(0, 50) + '...'
@@ -1,14 +1,38 @@
 # src/api/app.py
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from src.core.config import config
 from src.pipeline.scheduler import scheduler
+from src.db.session import get_shared_connection, get_read_connection, close_shared_connection
+from src.core.http import get_http_session, close_http_session
+from src.services.feed_service import FeedService
+from src.services.pipeline_service import PipelineService
 from .routes import announcements, pipeline
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared connections, services and scheduler for the app's lifetime"""
+    config.ensure_dirs()
+    await get_shared_connection()
+    await get_read_connection()
+    await get_http_session()
+    app.state.feed_service = FeedService()
+    app.state.pipeline_service = PipelineService()
+    scheduler.start()
+    try:
+        yield
+    finally:
+        scheduler.stop()
+        await close_http_session()
+        await close_shared_connection()
+
 app = FastAPI(
     title="EGP Pipeline API",
     description="API for EGP announcement processing pipeline",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -22,14 +46,4 @@ app.add_middleware(
 
 # Include routers
 app.include_router(announcements.router, prefix="/api/announcements", tags=["announcements"])
-app.include_router(pipeline.router, prefix="/api/pipeline", tags=["pipeline"])
-
-@app.on_event("startup")
-async def startup_event():
-    """Start scheduler on application startup"""
-    scheduler.start()
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Stop scheduler on application shutdown"""
-    scheduler.stop()
\ No newline at end of file
+app.include_router(pipeline.router, prefix="/api/pipeline", tags=["pipeline"])
\ No newline at end of file
@@ -0,0 +1,13 @@
+# src/api/dependencies.py
+
+from fastapi import Request
+from src.services.feed_service import FeedService
+from src.services.pipeline_service import PipelineService
+
+def get_feed_service(request: Request) -> FeedService:
+    """App-lifetime FeedService created in the lifespan"""
+    return request.app.state.feed_service
+
+def get_pipeline_service(request: Request) -> PipelineService:
+    """App-lifetime PipelineService created in the lifespan"""
+    return request.app.state.pipeline_service
@@ -1,46 +1,84 @@
 # src/api/routes/announcements.py
 
-from fastapi import APIRouter, HTTPException
-from typing import List, Optional
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response
+from typing import Any, Dict, Optional
 from src.core.constants import Status
 from src.services.feed_service import FeedService
+from src.api.dependencies import get_feed_service
 
 router = APIRouter()
-service = FeedService()
+
+# Data only changes on the scheduled pipeline runs, so let clients and
+# proxies reuse responses; the ETag lets them revalidate cheaply
+ANNOUNCEMENTS_CACHE_CONTROL = "public, max-age=600, stale-while-revalidate=1800"
+STATISTICS_CACHE_CONTROL = "public, max-age=3600"
+
+def json_response(content: Any, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Encode with orjson in one C call, skipping FastAPI's jsonable_encoder pass"""
+    return Response(orjson.dumps(content), media_type="application/json", headers=headers)
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an entity tag"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in tags or "*" in tags
 
 @router.get("")
 async def get_announcements(
+    request: Request,
     dept_id: Optional[str] = None,
     status: Optional[Status] = None,
     days: int = 7,
-    limit: int = 50
+    limit: int = 50,
+    service: FeedService = Depends(get_feed_service)
 ):
     """Get announcements with filters"""
     try:
+        etag = await service.get_etag()
+        headers = {"ETag": etag, "Cache-Control": ANNOUNCEMENTS_CACHE_CONTROL}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        
         announcements = await service.get_announcements(dept_id, status, days, limit)
-        return {
+        return json_response({
             "count": len(announcements),
             "results": announcements
-        }
+        }, headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/statistics")
-async def get_statistics(days: int = 7):
+async def get_statistics(
+    request: Request,
+    days: int = 7,
+    service: FeedService = Depends(get_feed_service)
+):
     """Get announcement statistics"""
     try:
-        return await service.get_statistics(days)
+        etag = await service.get_etag()
+        headers = {"ETag": etag, "Cache-Control": STATISTICS_CACHE_CONTROL}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        
+        return json_response(await service.get_statistics(days), headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{project_id}")
-async def get_announcement(project_id: str):
+async def get_announcement(
+    project_id: str,
+    service: FeedService = Depends(get_feed_service)
+):
     """Get announcement details"""
     try:
         announcement = await service.get_announcement_details(project_id)
         if not announcement:
             raise HTTPException(status_code=404, detail="Announcement not found")
-        return announcement
+        return json_response(announcement)
     except HTTPException:
         raise
     except Exception as e:
@@ -1,20 +1,26 @@
 # src/api/routes/pipeline.py
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from typing import List, Optional
 from src.services.pipeline_service import PipelineService
+from src.api.dependencies import get_pipeline_service
 
 router = APIRouter()
-service = PipelineService()
 
-@router.post("/start")
-async def start_pipeline(dept_ids: Optional[List[str]] = None):
-    """Start pipeline run"""
+@router.post("/start", status_code=202)
+async def start_pipeline(
+    background_tasks: BackgroundTasks,
+    dept_ids: Optional[List[str]] = None,
+    service: PipelineService = Depends(get_pipeline_service)
+):
+    """Start pipeline run in the background; poll /status?job_id=... for the outcome"""
     try:
-        results = await service.start_pipeline(dept_ids)
+        job_id = service.create_job(dept_ids)
+        background_tasks.add_task(service.run_job, job_id, dept_ids)
         return {
-            "message": "Pipeline started successfully",
-            "results": results
+            "message": "Pipeline started",
+            "job_id": job_id,
+            "status": "accepted"
         }
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -22,9 +28,19 @@ async def start_pipeline(dept_ids: Optional[List[str]] = None):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/status")
-async def get_status():
-    """Get pipeline status"""
+async def get_status(
+    job_id: Optional[str] = None,
+    service: PipelineService = Depends(get_pipeline_service)
+):
+    """Get pipeline status, or the status of one background run"""
     try:
+        if job_id:
+            job = service.get_job(job_id)
+            if not job:
+                raise HTTPException(status_code=404, detail="Job not found")
+            return job
         return service.get_pipeline_status()
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
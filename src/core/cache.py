@@ -0,0 +1,73 @@
+# src/core/cache.py
+
+import asyncio
+import time
+import weakref
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+# Every cached function, so a pipeline run can invalidate them all at once
+_registry: List[Callable] = []
+
+def ttl_cache(ttl: float, maxsize: int = 128):
+    """Cache an async function's results per argument tuple for ttl seconds
+
+    Concurrent misses on the same arguments are coalesced: the first caller
+    runs the function and the others wait for it and take its result.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        entries: Dict[Tuple, Tuple[float, Any]] = {}
+        # Per event loop (see src.core.locks), the lock for each key being
+        # fetched and how many callers hold or wait on it; dropped at zero
+        in_flight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple, list]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        def lookup(key: Tuple):
+            entry = entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return True, entry[1]
+            return False, None
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            hit, value = lookup(key)
+            if hit:
+                return value
+
+            locks = in_flight.setdefault(asyncio.get_running_loop(), {})
+            slot = locks.setdefault(key, [asyncio.Lock(), 0])
+            slot[1] += 1
+            try:
+                async with slot[0]:
+                    # Filled in by whoever held the lock before us
+                    hit, value = lookup(key)
+                    if hit:
+                        return value
+
+                    value = await func(*args, **kwargs)
+
+                    now = time.monotonic()
+                    # Drop expired entries first, then the oldest if still full
+                    if len(entries) >= maxsize:
+                        for stale in [k for k, (expiry, _) in entries.items() if expiry <= now]:
+                            del entries[stale]
+                    if len(entries) >= maxsize:
+                        del entries[next(iter(entries))]
+                    entries[key] = (now + ttl, value)
+                    return value
+            finally:
+                slot[1] -= 1
+                if not slot[1]:
+                    del locks[key]
+
+        wrapper.cache_clear = entries.clear
+        _registry.append(wrapper)
+        return wrapper
+    return decorator
+
+def invalidate_caches():
+    """Clear every ttl_cache, e.g. after the pipeline has written new data"""
+    for func in _registry:
+        func.cache_clear()
@@ -2,8 +2,9 @@
 
 from pathlib import Path
 from typing import Dict, Any
+from functools import lru_cache
 import os
-import json
+import orjson
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -20,11 +21,12 @@ class Config:
         """Load configuration from environment variables"""
         # Database
         self.db_path = self.base_dir / "data" / "egp.db"
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
         # API Configuration
         self.api_host = os.getenv("API_HOST", "0.0.0.0")
         self.api_port = int(os.getenv("API_PORT", "8000"))
+        self.api_workers = int(os.getenv("API_WORKERS", "1"))
+        self.debug = os.getenv("DEBUG", "false").lower() in ("1", "true", "yes")
         
         # EGP Feed Configuration
         self.feed_base_url = os.getenv(
@@ -32,30 +34,45 @@ class Config:
             "http://process3.gprocurement.go.th/EPROCRssFeedWeb/egpannouncerss.xml"
         )
         self.feed_timeout = int(os.getenv("FEED_TIMEOUT", "30"))
+        # Stop parsing a feed after this many items (0 = read the whole feed)
+        self.feed_max_items = int(os.getenv("FEED_MAX_ITEMS", "0"))
+        
+        # Pipeline concurrency: departments processed at once, and HTTP
+        # requests in flight per host across the whole pipeline
+        self.max_concurrent_departments = int(os.getenv("MAX_CONCURRENT_DEPARTMENTS", "8"))
+        self.max_concurrent_requests = int(os.getenv("MAX_CONCURRENT_REQUESTS", "20"))
         
         # PDF Storage
         self.pdf_dir = self.base_dir / "data" / "pdfs"
-        self.pdf_dir.mkdir(parents=True, exist_ok=True)
         
         # Logging
         self.log_dir = self.base_dir / "data" / "logs"
-        self.log_dir.mkdir(parents=True, exist_ok=True)
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
         
         # Schedule Configuration
         self.morning_run_time = os.getenv("MORNING_RUN_TIME", "08:30")
         self.evening_run_time = os.getenv("EVENING_RUN_TIME", "17:30")
         
+    def ensure_dirs(self):
+        """Create the data directories; called once at startup, not on import"""
+        for directory in (self.db_path.parent, self.pdf_dir, self.log_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+        
     def as_dict(self) -> Dict[str, Any]:
-        """Return configuration as dictionary"""
+        """Return configuration as dictionary (paths are left as Path objects)"""
         return {
-            "db_path": str(self.db_path),
+            "db_path": self.db_path,
             "api_host": self.api_host,
             "api_port": self.api_port,
+            "api_workers": self.api_workers,
+            "debug": self.debug,
             "feed_base_url": self.feed_base_url,
             "feed_timeout": self.feed_timeout,
-            "pdf_dir": str(self.pdf_dir),
-            "log_dir": str(self.log_dir),
+            "feed_max_items": self.feed_max_items,
+            "max_concurrent_departments": self.max_concurrent_departments,
+            "max_concurrent_requests": self.max_concurrent_requests,
+            "pdf_dir": self.pdf_dir,
+            "log_dir": self.log_dir,
             "log_level": self.log_level,
             "morning_run_time": self.morning_run_time,
             "evening_run_time": self.evening_run_time
@@ -63,7 +80,16 @@ class Config:
         
     def __str__(self) -> str:
         """String representation of configuration"""
-        return json.dumps(self.as_dict(), indent=2)
+        return orjson.dumps(
+            self.as_dict(),
+            default=str,
+            option=orjson.OPT_INDENT_2
+        ).decode()
+
+@lru_cache(maxsize=1)
+def get_settings() -> Config:
+    """Get the application configuration, read from the environment once"""
+    return Config()
 
-# Create global config instance
-config = Config()
\ No newline at end of file
+# Global config instance
+config = get_settings()
\ No newline at end of file
@@ -1,6 +1,6 @@
 # src/core/constants.py
 
-from enum import Enum
+from enum import Enum, unique
 from typing import Dict, List
 
 # Department configurations
@@ -12,19 +12,26 @@ DEPARTMENTS = {
     # Add more departments as needed
 }
 
+@unique
 class Status(str, Enum):
     """Pipeline status values"""
     PENDING = "pending"
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+
+# Value -> member lookup, cheaper than calling Status(value) on hot paths.
+# Members hash like their values, so a Status member also finds itself.
+STATUS_MAP: Dict[str, Status] = {member.value: member for member in Status}
     
+@unique
 class ProcurementMethod(str, Enum):
     """Procurement method codes"""
     E_BIDDING = "16"
     E_MARKET = "15"
     SPECIAL = "17"
     
+@unique
 class AnnouncementType(str, Enum):
     """Announcement type codes"""
     PROCUREMENT_PLAN = "P0"
@@ -50,6 +57,7 @@ FEED_TIME_WINDOWS = [
 ]
 
 # Database table names
+@unique
 class Tables(str, Enum):
     """Database table names"""
     ANNOUNCEMENTS = "announcements"
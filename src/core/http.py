@@ -0,0 +1,57 @@
+# src/core/http.py
+
+import asyncio
+import ssl
+from typing import Optional
+import aiohttp
+from src.core.config import config
+from src.core.locks import loop_lock
+
+# Keep-alive connections kept in total. Feed and PDF downloads hit few
+# hosts, so the per-host cap (config.max_concurrent_requests) is what
+# rate-limits the pipeline: requests beyond it wait for a free connection
+MAX_CONNECTIONS = 100
+
+# Seconds a resolved host address is reused
+DNS_CACHE_TTL = 300
+
+# The EGP document and PDF hosts are fetched without certificate
+# verification; built once and passed per request as ssl=NO_VERIFY_SSL
+NO_VERIFY_SSL = ssl.create_default_context()
+NO_VERIFY_SSL.check_hostname = False
+NO_VERIFY_SSL.verify_mode = ssl.CERT_NONE
+
+# One aiohttp session shared by the pipeline processors. The API opens it in
+# its lifespan; pipeline runs outside the API open it on first use. A
+# session only works on the loop it was opened on, so it's reopened when
+# used from another (e.g. each Streamlit asyncio.run)
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Get the shared HTTP session, opening it if needed"""
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    async with loop_lock("http.session"):
+        if _session is not None and _session_loop is not loop:
+            # Opened on a loop that has since been closed; its connections
+            # went with it
+            _session = None
+        if _session is None or _session.closed:
+            _session_loop = loop
+            _session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=MAX_CONNECTIONS,
+                    limit_per_host=config.max_concurrent_requests,
+                    ttl_dns_cache=DNS_CACHE_TTL
+                )
+            )
+        return _session
+
+async def close_http_session():
+    """Close the shared HTTP session"""
+    global _session
+    async with loop_lock("http.session"):
+        if _session is not None and _session_loop is asyncio.get_running_loop():
+            await _session.close()
+        _session = None
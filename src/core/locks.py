@@ -0,0 +1,21 @@
+# src/core/locks.py
+
+import asyncio
+import weakref
+from typing import Dict
+
+# An asyncio.Lock belongs to the event loop that first waits on it, and
+# Streamlit runs each pipeline or document fetch in a fresh asyncio.run.
+# Module-level locks are therefore kept per running loop, and dropped
+# with it
+_loop_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+def loop_lock(name: str) -> asyncio.Lock:
+    """Get the lock called name for the running event loop"""
+    locks = _loop_locks.setdefault(asyncio.get_running_loop(), {})
+    lock = locks.get(name)
+    if lock is None:
+        lock = locks[name] = asyncio.Lock()
+    return lock
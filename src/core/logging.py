@@ -1,10 +1,10 @@
 # src/core/logging.py
 
 import logging
+import logging.handlers
 import sys
 import os
-from datetime import datetime
-from pathlib import Path
+from functools import lru_cache
 from typing import Optional
 from .config import config
 
@@ -50,9 +50,19 @@ class CustomFormatter(logging.Formatter):
         logging.CRITICAL: bold_red + "%(asctime)s - %(name)s - %(levelname)s - %(message)s" + reset
     }
     
+    def __init__(self):
+        super().__init__(datefmt="%Y-%m-%d %H:%M:%S")
+        # One formatter per level, built once instead of per record
+        self._formatters = {
+            level: logging.Formatter(fmt, datefmt="%Y-%m-%d %H:%M:%S")
+            for level, fmt in self.FORMATS.items()
+        }
+    
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt, datefmt="%Y-%m-%d %H:%M:%S")
+        formatter = self._formatters.get(record.levelno)
+        if formatter is None:
+            # Custom level without a color; plain message like Formatter(None)
+            return super().format(record)
         return formatter.format(record)
 
 class ThaiStreamHandler(logging.StreamHandler):
@@ -64,11 +74,9 @@ class ThaiStreamHandler(logging.StreamHandler):
             
             if stream in (sys.stdout, sys.stderr):
                 try:
-                    if isinstance(msg, str):
-                        msg = msg.encode('utf-8', errors='replace').decode('utf-8')
                     stream.write(msg + self.terminator)
-                except Exception:
-                    # Fallback for any encoding issues
+                except UnicodeEncodeError:
+                    # Console can't encode Thai text; write UTF-8 bytes directly
                     stream.buffer.write(msg.encode('utf-8', errors='replace'))
                     stream.buffer.write(self.terminator.encode('utf-8'))
             else:
@@ -77,13 +85,18 @@ class ThaiStreamHandler(logging.StreamHandler):
         except Exception:
             self.handleError(record)
 
-# Rest of the logging.py code remains the same...
+# Rotated log files kept, one per day
+LOG_BACKUP_DAYS = 14
 
+@lru_cache(maxsize=None)
 def setup_logger(name: str, log_file: Optional[str] = None) -> logging.Logger:
-    """Set up logger with console and file handlers"""
+    """Set up logger with console and file handlers
+    
+    Cached per (name, log_file), so repeated calls never stack handlers.
+    """
     logger = logging.getLogger(name)
     
-    # Only configure if handlers haven't been set up
+    # Only configure if handlers haven't been set up elsewhere
     if not logger.handlers:
         logger.setLevel(config.log_level)
         
@@ -94,11 +107,15 @@ def setup_logger(name: str, log_file: Optional[str] = None) -> logging.Logger:
         
         # File handler if log_file is specified
         if log_file:
-            # Create log filename with date
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            log_path = config.log_dir / f"{log_file}_{date_str}.log"
+            config.log_dir.mkdir(parents=True, exist_ok=True)
             
-            file_handler = logging.FileHandler(log_path, encoding='utf-8')
+            # Roll over at midnight; old files get a date suffix
+            file_handler = logging.handlers.TimedRotatingFileHandler(
+                config.log_dir / f"{log_file}.log",
+                when='midnight',
+                backupCount=LOG_BACKUP_DAYS,
+                encoding='utf-8'
+            )
             file_handler.setFormatter(
                 logging.Formatter(
                     "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
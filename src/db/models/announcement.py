@@ -1,7 +1,34 @@
 from datetime import datetime
-from typing import Optional
-from dataclasses import dataclass, asdict
-from src.core.constants import Status
+from typing import Iterable, Iterator, Optional
+from dataclasses import dataclass, fields
+from src.core.constants import Status, STATUS_MAP
+
+def _parse_datetime(value: str) -> Optional[datetime]:
+    """Parse a stored timestamp, None if it isn't ISO formatted
+    
+    Values that aren't strings (None, datetimes) are passed through as is.
+    """
+    try:
+        return datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+    except AttributeError:
+        return value
+    except ValueError:
+        return None
+
+def _parse_status(value: str) -> Status:
+    """Parse a stored status, falling back to pending"""
+    return STATUS_MAP.get(value, Status.PENDING)
+
+def _identity(value):
+    return value
+
+# Conversions from database column values, by field name
+_ROW_CONVERTERS = {
+    'submission_date': _parse_datetime,
+    'created_at': _parse_datetime,
+    'updated_at': _parse_datetime,
+    'status': _parse_status
+}
 
 @dataclass
 class Announcement:
@@ -33,7 +60,7 @@ class Announcement:
         
         # Ensure status is always a Status enum
         if isinstance(self.status, str):
-            self.status = Status(self.status)
+            self.status = STATUS_MAP.get(self.status) or Status(self.status)
         
     def update(self, **kwargs):
         """Update announcement attributes"""
@@ -41,7 +68,7 @@ class Announcement:
             if hasattr(self, key):
                 # Handle special cases
                 if key == 'status' and isinstance(value, str):
-                    value = Status(value)
+                    value = STATUS_MAP.get(value) or Status(value)
                 elif key in ['submission_date', 'created_at', 'updated_at'] and isinstance(value, str):
                     value = datetime.fromisoformat(value)
                 
@@ -51,29 +78,59 @@ class Announcement:
     @classmethod
     def from_dict(cls, data: dict) -> 'Announcement':
         """Create announcement from dictionary"""
-        # Convert string dates to datetime objects
-        date_fields = ['submission_date', 'created_at', 'updated_at']
-        for field in date_fields:
-            if field in data and isinstance(data[field], str):
-                try:
-                    data[field] = datetime.fromisoformat(data[field].replace('Z', '+00:00'))
-                except ValueError:
-                    data[field] = None
+        # Convert known fields and drop unknown keys in one pass
+        field_names = cls.__dataclass_fields__
+        return cls(**{
+            k: _ROW_CONVERTERS.get(k, _identity)(v)
+            for k, v in data.items()
+            if k in field_names
+        })
 
-        # Convert status string to enum
-        if 'status' in data and isinstance(data['status'], str):
-            try:
-                data['status'] = Status(data['status'])
-            except ValueError:
-                data['status'] = Status.PENDING
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> Iterator['Announcement']:
+        """Create announcements from database rows sharing one column layout
+        
+        Column positions are resolved once from the first row; each row then
+        goes straight to the constructor without an intermediate dict.
+        """
+        plan = None
+        for row in rows:
+            if plan is None:
+                columns = {name: i for i, name in enumerate(row.keys())}
+                if all(field.name in columns for field in fields(cls)):
+                    plan = [
+                        (columns[field.name], _ROW_CONVERTERS.get(field.name))
+                        for field in fields(cls)
+                    ]
+                else:
+                    # Older schema missing some columns; take the general path
+                    plan = False
+            
+            if not plan:
+                yield cls.from_dict(dict(row))
+                continue
+            
+            yield cls(*[
+                convert(row[i]) if convert and row[i] is not None else row[i]
+                for i, convert in plan
+            ])
 
-        # Filter only valid fields and create instance
-        valid_data = {
-            k: v for k, v in data.items() 
-            if k in cls.__annotations__
-        }
+    @classmethod
+    def from_row(cls, row) -> 'Announcement':
+        """Create announcement from a single database row"""
+        return next(cls.from_rows((row,)))
+
+    @classmethod
+    def row_factory(cls, cursor, row: tuple) -> 'Announcement':
+        """sqlite3 row factory for rows selected in field order
         
-        return cls(**valid_data)
+        Set it on a cursor whose query selects every field, in declaration
+        order; rows come back as announcements with no sqlite3.Row between.
+        """
+        return cls(*[
+            convert(value) if convert and value is not None else value
+            for value, convert in zip(row, _FIELD_CONVERTERS)
+        ])
 
     def to_dict(self) -> dict:
         """Convert announcement to dictionary"""
@@ -98,4 +155,7 @@ class Announcement:
         }
         
         # Remove None values for cleaner output
-        return {k: v for k, v in data.items() if v is not None}
\ No newline at end of file
+        return {k: v for k, v in data.items() if v is not None}
+
+# Column value conversions in field order, for row_factory
+_FIELD_CONVERTERS = [_ROW_CONVERTERS.get(field.name) for field in fields(Announcement)]
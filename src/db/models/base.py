@@ -1,6 +1,6 @@
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Iterator
 
 @dataclass
 class BaseModel:
@@ -18,6 +18,23 @@ class BaseModel:
         filtered_data = {k: v for k, v in data.items() if k in valid_fields}
         return cls(**filtered_data)
 
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> Iterator['BaseModel']:
+        """Create model instances from database rows sharing one column layout
+        
+        Columns are matched to fields once, from the first row, and read by
+        position after that; no per-row dict is built.
+        """
+        plan = None
+        for row in rows:
+            if plan is None:
+                columns = {name: i for i, name in enumerate(row.keys())}
+                plan = [
+                    (field.name, columns[field.name])
+                    for field in fields(cls) if field.name in columns
+                ]
+            yield cls(**{name: row[i] for name, i in plan})
+
     def update(self, **kwargs):
         """Update model attributes"""
         for key, value in kwargs.items():
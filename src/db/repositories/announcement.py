@@ -1,125 +1,305 @@
 # src/db/repositories/announcement.py
 
-import sqlite3
 import asyncio
-from typing import Optional, List, Dict
+import aiosqlite
+import sqlite3
+from typing import Iterable, Optional, List, Dict, Set
 from contextlib import asynccontextmanager
-from datetime import datetime, timedelta
+from dataclasses import fields
+from datetime import date, datetime, time, timedelta
 from src.core.logging import get_logger
-from src.core.config import config
-from src.core.constants import Status
+from src.core.cache import ttl_cache
+from src.core.constants import Status, STATUS_MAP
 from src.db.models.announcement import Announcement
+from src.db.session import (
+    get_shared_connection, get_read_connection, write_lock, LOCAL_NOW_SQL
+)
 
 logger = get_logger(__name__)
 
+# Model columns in field order, so rows map onto Announcement positionally
+ANNOUNCEMENT_COLUMNS = ", ".join(field.name for field in fields(Announcement))
+
+# Feed fields written by upsert; the engine resolves insert vs update.
+# Timestamps are taken by SQLite rather than bound from Python
+UPSERT_SQL = f"""
+    INSERT INTO announcements (
+        project_id, dept_id, title, link, description,
+        status, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, {LOCAL_NOW_SQL}, {LOCAL_NOW_SQL})
+    ON CONFLICT(project_id) DO UPDATE SET
+        title = excluded.title,
+        link = excluded.link,
+        description = excluded.description,
+        status = excluded.status,
+        updated_at = excluded.updated_at
+"""
+
+def _upsert_params(announcement: Announcement) -> tuple:
+    """UPSERT_SQL parameters for an announcement, in column order"""
+    return (
+        announcement.project_id,
+        announcement.dept_id,
+        announcement.title,
+        announcement.link,
+        announcement.description,
+        announcement.status.value
+    )
+
+# Every column but id and the timestamps, in model field order; a None
+# value keeps the stored one, as to_dict() leaves it out. updated_at is
+# set by SQLite
+UPDATE_COLUMNS = [
+    field.name for field in fields(Announcement)
+    if field.name not in ('id', 'created_at', 'updated_at')
+]
+UPDATE_SQL = (
+    f"UPDATE announcements SET "
+    f"{', '.join(f'{column} = COALESCE(?, {column})' for column in UPDATE_COLUMNS)}, "
+    f"updated_at = {LOCAL_NOW_SQL} WHERE id = ?"
+)
+
+# Single-row writes hand back the written row instead of re-reading it
+# (RETURNING needs SQLite 3.35+)
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+UPSERT_RETURNING_SQL = f"{UPSERT_SQL} RETURNING {ANNOUNCEMENT_COLUMNS}"
+UPDATE_RETURNING_SQL = f"{UPDATE_SQL} RETURNING {ANNOUNCEMENT_COLUMNS}"
+
+SELECT_BY_PROJECT_ID_SQL = (
+    f"SELECT {ANNOUNCEMENT_COLUMNS} FROM announcements WHERE project_id = ? LIMIT 1"
+)
+
+def _as_announcements(cursor: aiosqlite.Cursor) -> aiosqlite.Cursor:
+    """Have a cursor over ANNOUNCEMENT_COLUMNS rows return Announcements"""
+    cursor.row_factory = Announcement.row_factory
+    return cursor
+
+# Bound parameters per statement, under SQLite's default limit
+SQLITE_MAX_PARAMS = 900
+
 class AnnouncementRepository:
     """Repository for working with announcements"""
+    HISTORICAL_STATS_TTL = 24 * 3600  # seconds; the key moves on with the date anyway
+    # Task whose batch holds the write lock; nested batches in that task
+    # join its transaction instead of waiting on the lock
+    _batch_task: Optional[asyncio.Task] = None
     
     def __init__(self):
         self.conn = None
+        self.read_conn = None
         self.logger = get_logger(self.__class__.__name__)
-        self._lock = asyncio.Lock()
 
     async def connect(self):
-        """Establish database connection"""
+        """Attach to the shared async database connections"""
         if not self.conn:
-            self.conn = sqlite3.connect(config.db_path)
-            self.conn.row_factory = sqlite3.Row
+            self.conn = await get_shared_connection()
+        if not self.read_conn:
+            self.read_conn = await get_read_connection()
 
     async def disconnect(self):
-        """Close database connection"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Detach from the shared connections; they stay open for other users"""
+        self.conn = None
+        self.read_conn = None
 
     async def __aenter__(self):
         """Async context manager entry"""
-        await self._lock.acquire()
         await self.connect()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        try:
-            if exc_type is None:
-                if self.conn:
-                    self.conn.commit()
-            else:
-                if self.conn:
-                    self.conn.rollback()
-        finally:
-            await self.disconnect()
-            self._lock.release()
-
-    async def execute_query(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
-        """Execute SQL query"""
+        """Async context manager exit
+        
+        Only detaches: the write connection is shared, so any transaction
+        open on it belongs to some task's batch, which commits it itself.
+        """
+        await self.disconnect()
+
+    async def execute_query(self, query: str, params: tuple = ()) -> aiosqlite.Cursor:
+        """Execute SQL query on the write connection"""
         if not self.conn:
             await self.connect()
+        return await self._execute(self.conn, query, params)
+
+    async def execute_read_query(self, query: str, params: tuple = ()) -> aiosqlite.Cursor:
+        """Execute a read on the read-only connection
+        
+        It sees committed data only, so reads inside a batch that must see
+        the batch's own writes go through execute_query. Exhaust or close
+        the cursor: an unfinished one keeps the connection on its snapshot.
+        """
+        if not self.read_conn:
+            await self.connect()
+        return await self._execute(self.read_conn, query, params)
 
+    async def _execute(
+        self,
+        conn: aiosqlite.Connection,
+        query: str,
+        params: tuple
+    ) -> aiosqlite.Cursor:
+        """Execute SQL query, logging it on failure"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(query, params)
-            return cursor
+            return await conn.execute(query, params)
         except Exception as e:
             self.logger.error(f"Query execution error: {e}")
             self.logger.error(f"Query: {query}")
             self.logger.error(f"Params: {params}")
             raise
 
+    @asynccontextmanager
+    async def batch(self):
+        """Group writes into one transaction, committed (or rolled back) on exit
+        
+        Every write runs in a batch: upsert, update and update_status open
+        their own when called outside one, and join the caller's inside one.
+        """
+        if not self.conn:
+            await self.connect()
+        
+        task = asyncio.current_task()
+        if AnnouncementRepository._batch_task is task:
+            yield self
+            return
+        
+        async with write_lock():
+            AnnouncementRepository._batch_task = task
+            try:
+                # Take SQLite's write lock up front rather than upgrading
+                # mid-transaction
+                await self.conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield self
+                except BaseException:
+                    await self.conn.rollback()
+                    raise
+                await self.conn.commit()
+            finally:
+                AnnouncementRepository._batch_task = None
+
     async def get_by_project_id(self, project_id: str) -> Optional[Announcement]:
         """Get announcement by project ID"""
-        cursor = await self.execute_query(
-            "SELECT * FROM announcements WHERE project_id = ?", 
-            (project_id,)
-        )
-        row = cursor.fetchone()
-        return Announcement.from_dict(dict(row)) if row else None
+        cursor = await self.execute_read_query(SELECT_BY_PROJECT_ID_SQL, (project_id,))
+        return await _as_announcements(cursor).fetchone()
+
+    async def _reselect(self, project_id: str) -> Optional[Announcement]:
+        """Re-read a row just written in the current transaction"""
+        # The read connection wouldn't see it until the transaction commits
+        cursor = await self.execute_query(SELECT_BY_PROJECT_ID_SQL, (project_id,))
+        return await _as_announcements(cursor).fetchone()
+
+    async def get_many_by_project_ids(
+        self,
+        project_ids: List[str],
+        chunk_size: int = 500
+    ) -> Dict[str, Announcement]:
+        """Get announcements for several project IDs, keyed by project ID
+        
+        One query per chunk_size IDs instead of one per ID; IDs with no
+        announcement are simply absent from the result.
+        """
+        chunk_size = min(chunk_size, SQLITE_MAX_PARAMS)
+        project_ids = list(dict.fromkeys(project_ids))
+        announcements = {}
+        for i in range(0, len(project_ids), chunk_size):
+            chunk = project_ids[i:i + chunk_size]
+            cursor = await self.execute_read_query(
+                f"SELECT {ANNOUNCEMENT_COLUMNS} FROM announcements "
+                f"WHERE project_id IN ({','.join('?' * len(chunk))})",
+                tuple(chunk)
+            )
+            for announcement in await _as_announcements(cursor).fetchall():
+                announcements[announcement.project_id] = announcement
+        return announcements
 
-    async def get_pending_processing(self) -> List[Announcement]:
-        """Get announcements pending processing"""
-        cursor = await self.execute_query("""
-            SELECT * FROM announcements 
+    async def get_existing_project_ids(self, project_ids: Iterable[str]) -> Set[str]:
+        """Which of the given project IDs are already stored
+        
+        One query per SQLITE_MAX_PARAMS IDs. Runs on the write connection,
+        so inside a batch it sees the batch's own writes.
+        """
+        project_ids = list(dict.fromkeys(project_ids))
+        existing = set()
+        for i in range(0, len(project_ids), SQLITE_MAX_PARAMS):
+            chunk = project_ids[i:i + SQLITE_MAX_PARAMS]
+            cursor = await self.execute_query(
+                f"SELECT project_id FROM announcements "
+                f"WHERE project_id IN ({','.join('?' * len(chunk))})",
+                tuple(chunk)
+            )
+            existing.update(row[0] for row in await cursor.fetchall())
+        return existing
+
+    async def get_pending_processing(
+        self,
+        batch_size: int = 500,
+        dept_id: Optional[str] = None
+    ) -> List[Announcement]:
+        """Get the oldest announcements pending processing, at most batch_size
+        
+        Optionally only one department's. Anything beyond the batch is
+        picked up by the next run.
+        """
+        cursor = await self.execute_read_query(f"""
+            SELECT {ANNOUNCEMENT_COLUMNS} FROM announcements 
             WHERE status = ? 
+                AND (? IS NULL OR dept_id = ?)
+            ORDER BY created_at ASC
+            LIMIT ?
+        """, (Status.PENDING.value, dept_id, dept_id, batch_size))
+        
+        return await _as_announcements(cursor).fetchall()
+
+    async def get_recent_by_dept(
+        self,
+        dept_id: Optional[str] = None,
+        status: Optional[Status] = None,
+        days: int = 7,
+        limit: int = 50
+    ) -> List[Announcement]:
+        """Get the most recent announcements, optionally for one department and status"""
+        # Whole days back from midnight, so the window only moves once a day
+        # and the listing ETag (which hashes today's date) stays valid
+        cutoff_date = datetime.combine(date.today() - timedelta(days=days), time.min)
+        status_value = (STATUS_MAP.get(status) or Status(status)).value if status else None
+        cursor = await self.execute_read_query(f"""
+            SELECT {ANNOUNCEMENT_COLUMNS} FROM announcements
+            WHERE created_at >= ?
+                AND (? IS NULL OR dept_id = ?)
+                AND (? IS NULL OR status = ?)
             ORDER BY created_at DESC
-        """, (Status.PENDING,))
+            LIMIT ?
+        """, (cutoff_date, dept_id, dept_id, status_value, status_value, limit))
         
-        return [
-            Announcement.from_dict(dict(row))
-            for row in cursor.fetchall()
-        ]
+        return await _as_announcements(cursor).fetchall()
 
     async def upsert(self, announcement: Announcement) -> Optional[Announcement]:
         """Insert or update announcement"""
-        data = announcement.to_dict()
-        now = datetime.now()
-        
-        if 'id' in data:
-            del data['id']
-        
-        cursor = await self.execute_query("""
-            INSERT INTO announcements (
-                project_id, dept_id, title, link, description,
-                status, created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(project_id) DO UPDATE SET
-                title = excluded.title,
-                link = excluded.link,
-                description = excluded.description,
-                status = excluded.status,
-                updated_at = ?
-        """, (
-            data['project_id'],
-            data.get('dept_id'),
-            data.get('title'),
-            data.get('link'),
-            data.get('description'),
-            data.get('status', Status.PENDING),
-            now,
-            now,
-            now
-        ))
-        self.conn.commit()  # Commit after upsert
-        return await self.get_by_project_id(announcement.project_id)
+        params = _upsert_params(announcement)
+        self._historical_stats.cache_clear()
+        
+        async with self.batch():
+            if SUPPORTS_RETURNING:
+                cursor = await self.execute_query(UPSERT_RETURNING_SQL, params)
+                return await _as_announcements(cursor).fetchone()
+            await self.execute_query(UPSERT_SQL, params)
+            return await self._reselect(announcement.project_id)
+
+    async def upsert_many(self, announcements: List[Announcement]) -> Set[str]:
+        """Insert or update announcements in one transaction
+        
+        Returns the project IDs that were newly inserted.
+        """
+        if not announcements:
+            return set()
+        
+        rows = {ann.project_id: _upsert_params(ann) for ann in announcements}
+        
+        async with self.batch():
+            existing = await self.get_existing_project_ids(rows)
+            await self.conn.executemany(UPSERT_SQL, list(rows.values()))
+        
+        self._historical_stats.cache_clear()
+        return set(rows) - existing
 
     async def update(self, announcement: Announcement) -> Optional[Announcement]:
         """Update announcement"""
@@ -127,41 +307,91 @@ class AnnouncementRepository:
         if 'id' not in data:
             raise ValueError("Cannot update announcement without ID")
             
-        id_value = data.pop('id')
-        if 'created_at' in data:
-            del data['created_at']
-            
-        data['updated_at'] = datetime.now()
+        values = (*map(data.get, UPDATE_COLUMNS), data['id'])
         
-        set_clause = ', '.join(f"{k} = ?" for k in data.keys())
-        query = f"UPDATE announcements SET {set_clause} WHERE id = ?"
+        self._historical_stats.cache_clear()
         
-        values = list(data.values()) + [id_value]
-        await self.execute_query(query, tuple(values))
-        self.conn.commit()  # Commit after update
-        return await self.get_by_project_id(data['project_id'])
+        async with self.batch():
+            if SUPPORTS_RETURNING:
+                cursor = await self.execute_query(UPDATE_RETURNING_SQL, values)
+                rows = await _as_announcements(cursor).fetchall()
+                return rows[0] if rows else None
+            
+            await self.execute_query(UPDATE_SQL, values)
+            return await self._reselect(data['project_id'])
 
     async def update_status(self, announcement_id: int, status: Status):
         """Update announcement status"""
-        await self.execute_query("""
-            UPDATE announcements
-            SET status = ?,
-                updated_at = ?
-            WHERE id = ?
-        """, (status, datetime.now(), announcement_id))
-        self.conn.commit()  # Commit after status update
+        async with self.batch():
+            await self.execute_query(f"""
+                UPDATE announcements
+                SET status = ?,
+                    updated_at = {LOCAL_NOW_SQL}
+                WHERE id = ?
+            """, ((STATUS_MAP.get(status) or Status(status)).value, announcement_id))
+        self._historical_stats.cache_clear()
 
-    async def get_statistics(self, days: int = 7) -> Dict:
-        """Get announcement statistics"""
-        cutoff_date = datetime.now() - timedelta(days=days)
-        cursor = await self.execute_query("""
+    async def _sum_stats(self, start_day: str, end_day: Optional[str] = None) -> Dict:
+        """Sum the daily_stats rollup over [start_day, end_day)"""
+        cursor = await self.execute_read_query("""
             SELECT 
-                COUNT(*) as total,
-                COUNT(CASE WHEN status = ? THEN 1 END) as pending,
-                COUNT(CASE WHEN status = ? THEN 1 END) as completed,
-                COUNT(CASE WHEN status = ? THEN 1 END) as failed
-            FROM announcements
-            WHERE created_at >= ?
-        """, (Status.PENDING, Status.COMPLETED, Status.FAILED, cutoff_date))
+                COALESCE(SUM(count), 0) as total,
+                COALESCE(SUM(CASE WHEN status = ? THEN count END), 0) as pending,
+                COALESCE(SUM(CASE WHEN status = ? THEN count END), 0) as completed,
+                COALESCE(SUM(CASE WHEN status = ? THEN count END), 0) as failed
+            FROM daily_stats
+            WHERE day >= ? AND (? IS NULL OR day < ?)
+        """, (
+            Status.PENDING.value, Status.COMPLETED.value, Status.FAILED.value,
+            start_day, end_day, end_day
+        ))
+        
+        return dict(await cursor.fetchone())
+
+    @ttl_cache(ttl=HISTORICAL_STATS_TTL)
+    async def _historical_stats(self, start_day: str, end_day: str) -> Dict:
+        """Statistics for the days before today, cached until a write clears them"""
+        return await self._sum_stats(start_day, end_day)
+
+    async def get_statistics(self, days: int = 7) -> Dict:
+        """Get announcement statistics
+        
+        Reads the daily_stats rollup, so the window is whole days. Past days
+        come from a cache and only today's rows are summed on each call.
+        """
+        today = datetime.now().date()
+        cutoff_day = (today - timedelta(days=days)).isoformat()
+        
+        historical = await self._historical_stats(cutoff_day, today.isoformat())
+        current = await self._sum_stats(today.isoformat())
+        
+        return {key: historical[key] + current[key] for key in historical}
+
+    async def get_fingerprint(self) -> tuple:
+        """Latest update time and row count; changes whenever the table does"""
+        cursor = await self.execute_read_query(
+            "SELECT MAX(updated_at), COUNT(*) FROM announcements"
+        )
+        return tuple(await cursor.fetchone())
+
+    async def get_department_statistics(self) -> Dict[str, Dict]:
+        """Get all-time announcement statistics per department"""
+        cursor = await self.execute_read_query("""
+            SELECT dept_id, status, SUM(count) as count
+            FROM daily_stats
+            GROUP BY dept_id, status
+        """)
+        
+        dept_stats = {}
+        for row in await cursor.fetchall():
+            stats = dept_stats.setdefault(row["dept_id"], {
+                "total": 0,
+                "pending": 0,
+                "completed": 0,
+                "failed": 0
+            })
+            stats["total"] += row["count"]
+            if row["status"] in stats:
+                stats[row["status"]] += row["count"]
         
-        return dict(cursor.fetchone())
\ No newline at end of file
+        return dept_stats
\ No newline at end of file
@@ -1,36 +1,94 @@
 # src/db/repositories/base.py
 
-from typing import TypeVar, Generic, Optional, List, Type
-from datetime import datetime
+from typing import AsyncIterator, TypeVar, Generic, Optional, List, Type
+from dataclasses import fields
 import sqlite3
+import aiosqlite
 import asyncio
 from contextlib import asynccontextmanager
 from src.core.logging import get_logger
+from src.db.session import (
+    get_shared_connection, get_read_connection, write_lock, LOCAL_NOW_SQL
+)
 
 T = TypeVar('T')
 
+# Rows pulled from a cursor per fetch when reading whole tables
+FETCH_CHUNK_SIZE = 1000
+
 class BaseRepository(Generic[T]):
     """Base repository with common database operations"""
     MAX_RETRIES = 3
     RETRY_DELAY = 0.1  # seconds
-    _write_lock = asyncio.Lock()  # Changed to Lock instead of Semaphore
 
     def __init__(self, model_class: Type[T], table_name: str):
         self.model_class = model_class
         self.table_name = table_name
         self.conn = None
+        self.read_conn = None
         self.logger = get_logger(self.__class__.__name__)
+        
+        # The model's columns are fixed, so build the SQL once; identical
+        # text on every call lets sqlite3 reuse its prepared statements.
+        # Timestamps are left out and stamped by SQLite
+        timestamps = [
+            f.name for f in fields(model_class) if f.name in ('created_at', 'updated_at')
+        ]
+        self._insert_columns = [
+            f.name for f in fields(model_class) if f.name != 'id' and f.name not in timestamps
+        ]
+        # A None value (left out by to_dict) keeps the stored one on update
+        self._update_columns = self._insert_columns
+        touch = f", updated_at = {LOCAL_NOW_SQL}" if 'updated_at' in timestamps else ""
+        self._sql_select_all = f"SELECT * FROM {table_name}"
+        self._sql_select_by_id = f"SELECT * FROM {table_name} WHERE id = ?"
+        self._sql_delete_by_id = f"DELETE FROM {table_name} WHERE id = ?"
+        placeholders = ['?'] * len(self._insert_columns) + [LOCAL_NOW_SQL] * len(timestamps)
+        self._sql_insert = (
+            f"INSERT INTO {table_name} ({', '.join(self._insert_columns + timestamps)}) "
+            f"VALUES ({', '.join(placeholders)})"
+        )
+        self._sql_update_by_id = (
+            f"UPDATE {table_name} SET "
+            f"{', '.join(f'{c} = COALESCE(?, {c})' for c in self._update_columns)}{touch} WHERE id = ?"
+        )
+
+    async def connect(self):
+        """Attach to the shared async database connections"""
+        if not self.conn:
+            self.conn = await get_shared_connection()
+        if not self.read_conn:
+            self.read_conn = await get_read_connection()
+
+    async def execute_query(self, query: str, params: tuple = ()) -> aiosqlite.Cursor:
+        """Execute SQL query on the write connection"""
+        if not self.conn:
+            await self.connect()
+        return await self._execute(self.conn, query, params)
+
+    async def execute_read_query(self, query: str, params: tuple = ()) -> aiosqlite.Cursor:
+        """Execute a read on the read-only connection
+        
+        Exhaust or close the cursor: an unfinished one keeps the connection
+        on its snapshot.
+        """
+        if not self.read_conn:
+            await self.connect()
+        return await self._execute(self.read_conn, query, params)
 
-    async def execute_query(self, query: str, params: tuple = ()) -> sqlite3.Cursor:
+    async def _execute(
+        self,
+        conn: aiosqlite.Connection,
+        query: str,
+        params: tuple
+    ) -> aiosqlite.Cursor:
         """Execute SQL query with retries"""
         retries = 0
         last_error = None
         
         while retries < self.MAX_RETRIES:
             try:
-                cursor = self.conn.cursor()
-                cursor.execute(query, params)
-                return cursor
+                return await conn.execute(query, params)
             except sqlite3.OperationalError as e:
                 if "database is locked" in str(e):
                     last_error = e
@@ -50,39 +108,45 @@ class BaseRepository(Generic[T]):
 
     async def execute_write_query(self, query: str, params: tuple = ()):
         """Execute write query with locking"""
-        async with self._write_lock:
+        async with write_lock():
             try:
                 cursor = await self.execute_query(query, params)
-                self.conn.commit()
+                await self.conn.commit()
                 return cursor
             except Exception as e:
-                self.conn.rollback()
+                await self.conn.rollback()
                 raise
 
     async def get_by_id(self, id: int) -> Optional[T]:
         """Get single record by ID"""
-        query = f"SELECT * FROM {self.table_name} WHERE id = ?"
-        cursor = await self.execute_query(query, (id,))
-        row = cursor.fetchone()
-        return self.model_class.from_dict(dict(row)) if row else None
+        cursor = await self.execute_read_query(self._sql_select_by_id, (id,))
+        row = await cursor.fetchone()
+        return next(self.model_class.from_rows((row,))) if row else None
+
+    async def iter_all(self, chunk_size: int = FETCH_CHUNK_SIZE) -> AsyncIterator[T]:
+        """Yield all records, fetching chunk_size rows at a time
+        
+        Memory stays bounded by the chunk, not the table. Reads come from one
+        snapshot, so writes made while iterating don't show up.
+        """
+        cursor = await self.execute_read_query(self._sql_select_all)
+        try:
+            while rows := await cursor.fetchmany(chunk_size):
+                for record in self.model_class.from_rows(rows):
+                    yield record
+        finally:
+            await cursor.close()
 
     async def get_all(self) -> List[T]:
         """Get all records"""
-        query = f"SELECT * FROM {self.table_name}"
-        cursor = await self.execute_query(query)
-        return [self.model_class.from_dict(dict(row)) for row in cursor.fetchall()]
+        return [record async for record in self.iter_all()]
 
     async def create(self, model: T) -> Optional[T]:
         """Create new record"""
         data = model.to_dict()
-        if 'id' in data:
-            del data['id']
+        values = tuple(map(data.get, self._insert_columns))
         
-        columns = ', '.join(data.keys())
-        placeholders = ', '.join('?' * len(data))
-        query = f"INSERT INTO {self.table_name} ({columns}) VALUES ({placeholders})"
-        
-        cursor = await self.execute_write_query(query, tuple(data.values()))
+        cursor = await self.execute_write_query(self._sql_insert, values)
         if cursor and cursor.lastrowid:
             return await self.get_by_id(cursor.lastrowid)
         return None
@@ -93,23 +157,15 @@ class BaseRepository(Generic[T]):
         if 'id' not in data:
             raise ValueError("Cannot update model without ID")
         
-        id_value = data.pop('id')
-        if 'created_at' in data:
-            del data['created_at']
-        
-        data['updated_at'] = datetime.now()
-        
-        set_clause = ', '.join(f"{k} = ?" for k in data.keys())
-        query = f"UPDATE {self.table_name} SET {set_clause} WHERE id = ?"
+        id_value = data['id']
+        values = (*map(data.get, self._update_columns), id_value)
         
-        values = list(data.values()) + [id_value]
-        await self.execute_write_query(query, tuple(values))
+        await self.execute_write_query(self._sql_update_by_id, values)
         return await self.get_by_id(id_value)
 
     async def delete(self, id: int) -> bool:
         """Delete record by ID"""
-        query = f"DELETE FROM {self.table_name} WHERE id = ?"
-        cursor = await self.execute_write_query(query, (id,))
+        cursor = await self.execute_write_query(self._sql_delete_by_id, (id,))
         return cursor.rowcount > 0
 
     async def find_by(self, **kwargs) -> List[T]:
@@ -117,16 +173,18 @@ class BaseRepository(Generic[T]):
         conditions = ' AND '.join(f"{k} = ?" for k in kwargs.keys())
         query = f"SELECT * FROM {self.table_name} WHERE {conditions}"
         
-        cursor = await self.execute_query(query, tuple(kwargs.values()))
-        return [self.model_class.from_dict(dict(row)) for row in cursor.fetchall()]
+        cursor = await self.execute_read_query(query, tuple(kwargs.values()))
+        return list(self.model_class.from_rows(await cursor.fetchall()))
 
     @asynccontextmanager
     async def transaction(self):
         """Async transaction context manager"""
-        async with self._write_lock:
+        async with write_lock():
+            if not self.conn:
+                await self.connect()
             try:
                 yield self
-                self.conn.commit()
+                await self.conn.commit()
             except Exception:
-                self.conn.rollback()
+                await self.conn.rollback()
                 raise
\ No newline at end of file
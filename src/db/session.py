@@ -1,105 +1,384 @@
 # src/db/session.py
 
+import os
+import queue
 import sqlite3
+import threading
+import aiosqlite
 from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-from typing import Generator
+from typing import Generator, Optional
 import asyncio
 from src.core.config import config
+from src.core.locks import loop_lock
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
 
-def init_db():
-    """Initialize database with schema"""
+# Columns added after the original announcements schema; older databases
+# get them through ALTER TABLE instead of being recreated
+ADDED_COLUMNS = {
+    "pdf_path": "TEXT",
+    "budget_amount": "REAL",
+    "quantity": "INTEGER",
+    "duration_years": "INTEGER",
+    "duration_months": "INTEGER",
+    "submission_date": "TIMESTAMP",
+    "contact_phone": "TEXT",
+    "contact_email": "TEXT"
+}
+
+# Connection-scoped settings applied to every connection we open. WAL is a
+# property of the database file, so it's set once in init_db (and by the
+# shared connection, which may be opened without init_db)
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",  # WAL makes this safe; fewer fsyncs per commit
+    "PRAGMA busy_timeout=5000",  # ms to wait on a locked database
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",  # ~20 MB page cache
+    "PRAGMA mmap_size=268435456"  # 256 MB memory-mapped reads
+)
+
+# Current local time as SQLite computes it, in the same layout as the
+# datetime values Python binds ("YYYY-MM-DD HH:MM:SS.fff"), so timestamps
+# written either way keep sorting correctly against each other
+LOCAL_NOW_SQL = "strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')"
+
+# Bind datetimes as "YYYY-MM-DD HH:MM:SS[.ffffff]" text. This is what
+# sqlite3's built-in adapter did (deprecated since Python 3.12); registering
+# it here keeps stored timestamps unchanged. Adapters are process-wide, so
+# this runs once on import rather than per connection. Columns are not
+# declared-type converted (no detect_types): timestamps come back as text
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+def _configure(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply row factory and connection PRAGMAs to a new connection
+    
+    Called once when a connection is opened, not each time it's checked out.
+    """
+    conn.row_factory = sqlite3.Row
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+# Announcements table and its indexes, applied by init_db in one script
+ANNOUNCEMENTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS announcements (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id TEXT UNIQUE NOT NULL,
+    dept_id TEXT,
+    title TEXT,
+    link TEXT,
+    description TEXT,
+    status TEXT DEFAULT 'pending',
+    pdf_path TEXT,
+    budget_amount REAL,  -- Using REAL for floating point numbers
+    quantity INTEGER,
+    duration_years INTEGER,
+    duration_months INTEGER,
+    submission_date TIMESTAMP,
+    contact_phone TEXT,
+    contact_email TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+INDEXES_SCHEMA = """
+-- project_id lookups use the UNIQUE constraint's own index
+-- (sqlite_autoindex_announcements_1, per EXPLAIN QUERY PLAN); a second one
+-- on the same column only doubles the B-tree work of every upsert
+DROP INDEX IF EXISTS idx_project_id;
+
+CREATE INDEX IF NOT EXISTS idx_dept_id ON announcements(dept_id);
+
+-- Pending-work query: status match, already in created_at order.
+-- Status-only lookups use its prefix, so idx_status is redundant
+CREATE INDEX IF NOT EXISTS idx_ann_status_created ON announcements(status, created_at);
+DROP INDEX IF EXISTS idx_status;
+
+-- Recent listings: walk created_at backwards and stop at the limit
+CREATE INDEX IF NOT EXISTS idx_ann_created ON announcements(created_at);
+"""
+
+# Per-day announcement counts by department and status, kept in step with
+# announcements by triggers so statistics never scan the full table.
+# WITHOUT ROWID stores rows in the primary key's B-tree, so a day-range
+# sum reads the counts straight from the index it searches
+DAILY_STATS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day DATE NOT NULL,
+    dept_id TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL DEFAULT '',
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, dept_id, status)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_stats_insert
+AFTER INSERT ON announcements
+BEGIN
+    INSERT INTO daily_stats (day, dept_id, status, count)
+    VALUES (date(NEW.created_at), COALESCE(NEW.dept_id, ''), COALESCE(NEW.status, ''), 1)
+    ON CONFLICT(day, dept_id, status) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_stats_update
+AFTER UPDATE OF status, dept_id, created_at ON announcements
+WHEN OLD.status IS NOT NEW.status
+    OR OLD.dept_id IS NOT NEW.dept_id
+    OR date(OLD.created_at) IS NOT date(NEW.created_at)
+BEGIN
+    UPDATE daily_stats SET count = count - 1
+    WHERE day = date(OLD.created_at)
+        AND dept_id = COALESCE(OLD.dept_id, '')
+        AND status = COALESCE(OLD.status, '');
+    INSERT INTO daily_stats (day, dept_id, status, count)
+    VALUES (date(NEW.created_at), COALESCE(NEW.dept_id, ''), COALESCE(NEW.status, ''), 1)
+    ON CONFLICT(day, dept_id, status) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_daily_stats_delete
+AFTER DELETE ON announcements
+BEGIN
+    UPDATE daily_stats SET count = count - 1
+    WHERE day = date(OLD.created_at)
+        AND dept_id = COALESCE(OLD.dept_id, '')
+        AND status = COALESCE(OLD.status, '');
+END;
+"""
+
+DAILY_STATS_BACKFILL = """
+INSERT INTO daily_stats (day, dept_id, status, count)
+SELECT date(created_at), COALESCE(dept_id, ''), COALESCE(status, ''), COUNT(*)
+FROM announcements
+GROUP BY 1, 2, 3;
+"""
+
+def reset_db(conn: sqlite3.Connection):
+    """Drop the announcements table and its rollup; init_db recreates them"""
+    conn.executescript("""
+        DROP TABLE IF EXISTS announcements;
+        DROP TABLE IF EXISTS daily_stats;
+    """)
+    logger.warning("Dropped announcements table")
+
+def init_db(reset: bool = False):
+    """Initialize database with schema
+    
+    Safe to call on every startup: existing data is kept and missing
+    columns are added. Pass reset=True to drop and recreate the table.
+    All schema changes run as one script in a single transaction.
+    """
     try:
-        with sqlite3.connect(config.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
+        config.ensure_dirs()
+        conn = _configure(sqlite3.connect(config.db_path))
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
             
-            # Drop existing table if needed
-            cursor.execute("DROP TABLE IF EXISTS announcements")
+            if reset:
+                reset_db(conn)
             
-            # Create announcements table with proper types
-            cursor.execute("""
-                CREATE TABLE announcements (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    project_id TEXT UNIQUE NOT NULL,
-                    dept_id TEXT,
-                    title TEXT,
-                    link TEXT,
-                    description TEXT,
-                    status TEXT DEFAULT 'pending',
-                    pdf_path TEXT,
-                    budget_amount REAL,  -- Using REAL for floating point numbers
-                    quantity INTEGER,
-                    duration_years INTEGER,
-                    duration_months INTEGER,
-                    submission_date TIMESTAMP,
-                    contact_phone TEXT,
-                    contact_email TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+            tables = {
+                row["name"]: row["sql"]
+                for row in conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table'")
+            }
+            script = ["BEGIN;", ANNOUNCEMENTS_SCHEMA]
             
-            # Create indexes
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_project_id 
-                ON announcements(project_id)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_dept_id 
-                ON announcements(dept_id)
-            """)
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_status 
-                ON announcements(status)
-            """)
+            # Bring tables created by older schemas up to date
+            if "announcements" in tables:
+                existing = {
+                    row["name"]
+                    for row in conn.execute("PRAGMA table_info(announcements)")
+                }
+                for column, column_type in ADDED_COLUMNS.items():
+                    if column not in existing:
+                        script.append(
+                            f"ALTER TABLE announcements ADD COLUMN {column} {column_type};"
+                        )
+                        logger.info(f"Adding column announcements.{column}")
             
-            conn.commit()
+            script.append(INDEXES_SCHEMA)
+            
+            # The rollup is derived data: rebuild it if it predates WITHOUT ROWID
+            rebuild_stats = "WITHOUT ROWID" not in (tables.get("daily_stats") or "").upper()
+            if rebuild_stats and "daily_stats" in tables:
+                script.append("DROP TABLE daily_stats;")
+            script.append(DAILY_STATS_SCHEMA)
+            
+            # Backfill the statistics rollup whenever it's (re)created
+            if rebuild_stats:
+                script.append(DAILY_STATS_BACKFILL)
+                logger.info("Backfilling daily_stats from announcements")
+            
+            script.append("COMMIT;")
+            conn.executescript("\n".join(script))
             logger.info("Database initialized successfully")
+        finally:
+            conn.close()
             
     except Exception as e:
         logger.error(f"Database error: {e}")
         raise
 
+class ConnectionPool:
+    """Bounded pool of configured SQLite connections
+    
+    Connections are opened lazily, up to size; after that acquire() waits
+    for one to be released. They may be used from any thread, one at a time.
+    """
+    def __init__(self, size: int):
+        self.size = size
+        self._idle: queue.SimpleQueue = queue.SimpleQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> sqlite3.Connection:
+        """Check out a connection"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if not can_open:
+            return self._idle.get()
+        try:
+            return _configure(sqlite3.connect(
+                config.db_path,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE
+            ))
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection, discarding anything it left uncommitted"""
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def close(self):
+        """Close the idle connections"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+pool = ConnectionPool(min(32, (os.cpu_count() or 1) * 2))
+
 @contextmanager
 def get_db() -> Generator[sqlite3.Connection, None, None]:
-    """Get database connection"""
+    """Get a pooled database connection"""
     conn = None
     try:
-        conn = sqlite3.connect(config.db_path)
-        conn.row_factory = sqlite3.Row
+        conn = pool.acquire()
         yield conn
     except Exception as e:
         logger.error(f"Database error: {e}")
         raise
     finally:
         if conn:
-            conn.close()
+            pool.release(conn)
 
 class AsyncDBConnection:
-    """Async database connection wrapper"""
+    """Async database connection wrapper
+    
+    Checks a connection out of the pool for the block and hands it back on
+    exit, committing or rolling back first.
+    """
     def __init__(self):
         self.conn = None
         self._lock = asyncio.Lock()
 
     async def __aenter__(self):
         await self._lock.acquire()
-        self.conn = sqlite3.connect(config.db_path)
-        self.conn.row_factory = sqlite3.Row
+        try:
+            self.conn = pool.acquire()
+        except BaseException:
+            self._lock.release()
+            raise
         return self.conn
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.conn:
-            if exc_type:
-                self.conn.rollback()
-            else:
-                self.conn.commit()
-            self.conn.close()
-        self._lock.release()
+        try:
+            if self.conn:
+                # sqlite3's own exit: commit, or roll back on error
+                self.conn.__exit__(exc_type, exc_val, exc_tb)
+        finally:
+            if self.conn:
+                pool.release(self.conn)
+                self.conn = None
+            self._lock.release()
 
 async def get_async_db():
     """Get async database connection"""
-    return AsyncDBConnection()
\ No newline at end of file
+    return AsyncDBConnection()
+
+# One aiosqlite connection shared by the async repositories' writes, and a
+# second, read-only one for their reads. Each runs on its own thread, so
+# under WAL reads see the last committed snapshot instead of queueing
+# behind an open write transaction. The API opens both in its lifespan;
+# pipeline runs outside the API open them on first use.
+_shared_conn: Optional[aiosqlite.Connection] = None
+_read_conn: Optional[aiosqlite.Connection] = None
+
+def write_lock() -> asyncio.Lock:
+    """Lock held for a transaction on the shared write connection
+    
+    Repositories share that connection, so a transaction must not have
+    another coroutine's statements or commit interleaved into it.
+    """
+    return loop_lock("db.write")
+
+async def _open_async(*pragmas: str) -> aiosqlite.Connection:
+    """Open a configured aiosqlite connection, then apply extra PRAGMAs"""
+    conn = await aiosqlite.connect(
+        config.db_path,
+        cached_statements=STATEMENT_CACHE_SIZE
+    )
+    conn.row_factory = aiosqlite.Row
+    # Readers keep going while the pipeline writes
+    await conn.execute("PRAGMA journal_mode=WAL")
+    for pragma in CONNECTION_PRAGMAS + pragmas:
+        await conn.execute(pragma)
+    return conn
+
+async def get_shared_connection() -> aiosqlite.Connection:
+    """Get the shared async connection, opening it if needed"""
+    global _shared_conn
+    async with loop_lock("db.shared_connection"):
+        if _shared_conn is None:
+            _shared_conn = await _open_async()
+        return _shared_conn
+
+async def get_read_connection() -> aiosqlite.Connection:
+    """Get the shared read-only async connection, opening it if needed
+    
+    Only for reads that needn't see an open transaction's own writes.
+    """
+    global _read_conn
+    async with loop_lock("db.shared_connection"):
+        if _read_conn is None:
+            _read_conn = await _open_async("PRAGMA query_only=ON")
+        return _read_conn
+
+async def close_shared_connection():
+    """Close the shared async connections"""
+    global _shared_conn, _read_conn
+    async with loop_lock("db.shared_connection"):
+        for conn in (_read_conn, _shared_conn):
+            if conn is not None:
+                await conn.close()
+        _shared_conn = _read_conn = None
@@ -1,45 +1,62 @@
 # src/pipeline/orchestrator.py
 
 from typing import List, Dict, Any, Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 import asyncio
+import time
+from src.core.config import config
 from src.core.logging import get_logger
 from src.core.constants import DEPARTMENTS, Status
-from .processors.base import BaseProcessor
+from .processors.base import BaseProcessor, ProcessorRunResult
 from .processors.feed import FeedProcessor
 from .processors.pdf import PDFProcessor
 
 logger = get_logger(__name__)
 
+# Work items buffered between two processors of a department
+STAGE_QUEUE_SIZE = 64
+
+def _empty_stats() -> Dict[str, float]:
+    """Per-processor summary counters"""
+    return {"successful": 0, "failed": 0, "total_time": 0.0}
+
 # src/pipeline/orchestrator.py
 
 class PipelineOrchestrator:
     """Orchestrates the execution of pipeline processors"""
     
     def __init__(self):
+        # Wall-clock start for reporting; durations use the monotonic clock
         self.start_time: Optional[datetime] = None
-        self.end_time: Optional[datetime] = None
+        self._start_ns: Optional[int] = None
+        self._execution_time: Optional[float] = None
         self._status = Status.PENDING
         self._results: Dict[str, Any] = {}
+        # Built once per run and shared by every department
+        self._processor_instances: List[BaseProcessor] = []
         # Store processor count directly
         self._processor_count = 2  # FeedProcessor and PDFProcessor
-    
-    @property
-    def processors(self) -> List[BaseProcessor]:
-        """Get list of processors"""
-        return [
-            FeedProcessor(),
-            PDFProcessor()
-        ]
+        # Summary counters per processor name, added to as departments finish
+        self._stats: Dict[str, Dict[str, float]] = {
+            name: _empty_stats() for name in ("FeedProcessor", "PDFProcessor")
+        }
+        # Departments processed at once; the rest wait their turn. Made per
+        # run, as a semaphore belongs to the event loop it's used on
+        self._dept_sema: Optional[asyncio.Semaphore] = None
     
     async def run(self, dept_ids: Optional[List[str]] = None) -> Dict[str, Any]:
         """Run the pipeline for specified departments"""
         self.start_time = datetime.now()
+        self._start_ns = time.monotonic_ns()
+        self._execution_time = None
         self._status = Status.PROCESSING
         
         try:
             # Use provided department IDs or all configured departments
             departments = dept_ids or list(DEPARTMENTS.keys())
+            self._processor_instances = [FeedProcessor(), PDFProcessor()]
+            self._dept_sema = asyncio.Semaphore(config.max_concurrent_departments or 8)
+            self._stats = {p.name: _empty_stats() for p in self._processor_instances}
             
             results = await asyncio.gather(*[
                 self._process_department(dept_id)
@@ -52,6 +69,8 @@ class PipelineOrchestrator:
             }
             
             self._status = Status.COMPLETED
+            # Stop the clock first so the summary carries the timings
+            self._stop_clock()
             return self.get_summary()
             
         except Exception as e:
@@ -60,29 +79,55 @@ class PipelineOrchestrator:
             raise
             
         finally:
-            self.end_time = datetime.now()
+            if self._execution_time is None:
+                self._stop_clock()
             self.log_execution_time()
     
     async def _process_department(self, dept_id: str) -> Dict[str, Any]:
-        """Process single department through all processors"""
+        """Process single department through all processors
+        
+        The processors run at the same time as linked stages, each taking
+        the previous one's output from a queue as it's produced, so PDF
+        downloads start while the feed is still being stored.
+        """
+        async with self._dept_sema:
+            return await self._run_department(dept_id)
+    
+    async def _run_department(self, dept_id: str) -> Dict[str, Any]:
+        """Run the processors for one department"""
         dept_results = {}
         
         try:
-            for processor in self.processors:  # Now gets fresh processor instances
-                logger.info(f"Running {processor.name} for department {dept_id}")
-                result = await processor.execute(dept_id)
-                dept_results[processor.name] = {
-                    "status": processor.status,
-                    "execution_time": processor.execution_time,
-                    "result": result
+            processors = self._processor_instances
+            queues = [asyncio.Queue(maxsize=STAGE_QUEUE_SIZE) for _ in processors[1:]]
+            inboxes = [None, *queues]
+            outboxes = [*queues, None]
+            
+            logger.info(
+                f"Running {', '.join(p.name for p in processors)} for department {dept_id}"
+            )
+            runs: List[ProcessorRunResult] = await asyncio.gather(*[
+                processor.execute(dept_id, inbox, outbox)
+                for processor, inbox, outbox in zip(processors, inboxes, outboxes)
+            ])
+            
+            # No await between here and the return, so these updates can't
+            # interleave with another department's
+            for run in runs:
+                stats = self._stats[run.name]
+                if run.status == Status.COMPLETED:
+                    stats["successful"] += 1
+                elif run.status == Status.FAILED:
+                    stats["failed"] += 1
+                stats["total_time"] += run.execution_time or 0
+                dept_results[run.name] = {
+                    "status": run.status,
+                    "execution_time": run.execution_time,
+                    "result": run.result
                 }
-                
-                # Stop processing if a processor fails
-                if processor.status == Status.FAILED:
-                    logger.error(
-                        f"{processor.name} failed for department {dept_id}"
-                    )
-                    break
+                if run.status == Status.FAILED:
+                    logger.error(f"{run.name} failed for department {dept_id}")
+                    dept_results[run.name]["error"] = run.error
                     
             return dept_results
             
@@ -106,37 +151,30 @@ class PipelineOrchestrator:
         }
         
         # Add processor-specific statistics
-        processor_names = ["FeedProcessor", "PDFProcessor"]  # Hardcode processor names
-        for processor_name in processor_names:
-            stats = {
-                "successful": sum(
-                    1 for dept_results in self._results.values()
-                    if dept_results.get(processor_name, {}).get("status") == Status.COMPLETED
-                ),
-                "failed": sum(
-                    1 for dept_results in self._results.values()
-                    if dept_results.get(processor_name, {}).get("status") == Status.FAILED
-                ),
-                "total_time": sum(
-                    float(dept_results.get(processor_name, {}).get("execution_time", 0) or 0)
-                    for dept_results in self._results.values()
-                )
-            }
-            summary[processor_name] = stats
+        for processor_name, stats in self._stats.items():
+            summary[processor_name] = dict(stats)
         
         return summary
     
+    def _stop_clock(self):
+        """Record the run's duration"""
+        self._execution_time = (time.monotonic_ns() - self._start_ns) / 1e9
+    
     def log_execution_time(self):
         """Log total execution time"""
-        if self.start_time and self.end_time:
-            duration = self.execution_time
-            logger.info(f"Pipeline executed in {duration:.2f} seconds")
+        if self._execution_time is not None:
+            logger.info(f"Pipeline executed in {self._execution_time:.2f} seconds")
     
     @property
     def execution_time(self) -> Optional[float]:
         """Get total execution time in seconds"""
-        if self.start_time and self.end_time:
-            return (self.end_time - self.start_time).total_seconds()
+        return self._execution_time
+    
+    @property
+    def end_time(self) -> Optional[datetime]:
+        """Wall-clock end of the last run, from its start and duration"""
+        if self.start_time and self._execution_time is not None:
+            return self.start_time + timedelta(seconds=self._execution_time)
         return None
     
     @property
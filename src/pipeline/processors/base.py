@@ -1,20 +1,41 @@
 # src/pipeline/processors/base.py
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
 from datetime import datetime
 from src.core.logging import get_logger
 from src.core.constants import Status
 
+@dataclass
+class ProcessorRunResult:
+    """Outcome of one processor run for one department
+    
+    start_time is the wall-clock start; execution_time is measured with the
+    monotonic clock, which is cheaper to read and immune to clock changes.
+    """
+    name: str
+    status: Status = Status.PROCESSING
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    start_time: Optional[datetime] = None
+    execution_time: Optional[float] = None  # seconds
+
 class BaseProcessor(ABC):
-    """Base class for pipeline processors"""
+    """Base class for pipeline processors
+    
+    Processors can run as linked stages: a stage reads work items from its
+    inbox queue and puts its own onto its outbox, and None marks the end of
+    a queue. Without queues a processor works on its own.
+    
+    A processor keeps no per-run state; each execute() returns its own
+    ProcessorRunResult, so one instance can serve many departments at once.
+    """
     
     def __init__(self):
         self.logger = get_logger(self.__class__.__name__)
-        self.start_time: Optional[datetime] = None
-        self.end_time: Optional[datetime] = None
-        self._status = Status.PENDING
-        self._error: Optional[str] = None
     
     @property
     @abstractmethod
@@ -23,61 +44,58 @@ class BaseProcessor(ABC):
         pass
     
     @abstractmethod
-    async def process(self, dept_id: str) -> Dict[str, Any]:
+    async def process(
+        self,
+        dept_id: str,
+        inbox: Optional[asyncio.Queue] = None,
+        outbox: Optional[asyncio.Queue] = None
+    ) -> Dict[str, Any]:
         """Process data for department"""
         pass
     
-    async def execute(self, dept_id: str) -> Dict[str, Any]:
-        """Execute processor with timing and error handling"""
-        self.start_time = datetime.now()
-        self._status = Status.PROCESSING
+    async def execute(
+        self,
+        dept_id: str,
+        inbox: Optional[asyncio.Queue] = None,
+        outbox: Optional[asyncio.Queue] = None
+    ) -> ProcessorRunResult:
+        """Execute processor with timing and error handling
+        
+        Errors are logged and recorded on the returned result, not raised.
+        """
+        run = ProcessorRunResult(self.name, start_time=datetime.now())
+        start_ns = time.monotonic_ns()
         
         try:
             self.logger.info(f"Starting {self.name} for department {dept_id}")
-            result = await self.process(dept_id)
-            self._status = Status.COMPLETED
-            return result
+            run.result = await self.process(dept_id, inbox, outbox)
+            run.status = Status.COMPLETED
             
         except Exception as e:
-            self._status = Status.FAILED
-            self._error = str(e)
+            run.status = Status.FAILED
+            run.error = str(e)
             self.logger.error(f"Error in {self.name}: {e}")
-            raise
+            if inbox is not None:
+                # Keep the stage before us from blocking on a full queue
+                async for _ in self.receive(inbox):
+                    pass
             
         finally:
-            self.end_time = datetime.now()
-            self.log_execution_time()
-    
-    def log_execution_time(self):
-        """Log execution time"""
-        if self.start_time and self.end_time:
-            duration = (self.end_time - self.start_time).total_seconds()
-            self.logger.info(f"{self.name} executed in {duration:.2f} seconds")
-    
-    @property
-    def execution_time(self) -> Optional[float]:
-        """Get execution time in seconds"""
-        if self.start_time and self.end_time:
-            return (self.end_time - self.start_time).total_seconds()
-        return None
-    
-    @property
-    def status(self) -> Status:
-        """Get current status"""
-        return self._status
+            if outbox is not None:
+                await outbox.put(None)
+            run.execution_time = (time.monotonic_ns() - start_ns) / 1e9
+            self.log_execution_time(run)
+        
+        return run
     
-    @property
-    def error(self) -> Optional[str]:
-        """Get error message if any"""
-        return self._error
+    async def receive(self, inbox: asyncio.Queue) -> AsyncIterator[Any]:
+        """Yield items from an inbox queue until its end marker"""
+        while (item := await inbox.get()) is not None:
+            yield item
+        # Leave the marker in place so a later read stops too
+        inbox.put_nowait(None)
     
-    def get_stats(self) -> Dict[str, Any]:
-        """Get processor statistics"""
-        return {
-            "name": self.name,
-            "status": self.status,
-            "error": self.error,
-            "execution_time": self.execution_time,
-            "start_time": self.start_time,
-            "end_time": self.end_time
-        }
\ No newline at end of file
+    def log_execution_time(self, run: ProcessorRunResult):
+        """Log execution time"""
+        if run.execution_time is not None:
+            self.logger.info(f"{self.name} executed in {run.execution_time:.2f} seconds")
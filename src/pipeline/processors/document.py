@@ -1,8 +1,7 @@
 # src/pipeline/processors/document.py
 
-import aiohttp
+import asyncio
 import aiofiles
-import ssl
 from typing import Dict, Any, Optional
 from pathlib import Path
 import json
@@ -13,6 +12,27 @@ from .base import BaseProcessor
 from src.core.config import config
 from src.db.repositories.announcement import AnnouncementRepository
 from src.core.constants import Status, ERROR_MESSAGES
+from src.core.http import get_http_session, NO_VERIFY_SSL
+
+# Bytes read from the network and written to disk at a time for ZIP downloads
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+def _extract_safely(zip_path: Path, target_dir: Path):
+    """Extract a ZIP file into target_dir, then delete the ZIP
+    
+    Blocking; run it in a worker thread.
+    """
+    with zipfile.ZipFile(zip_path) as zip_ref:
+        # Check for malicious paths (path traversal)
+        for zip_info in zip_ref.filelist:
+            if '..' in zip_info.filename or zip_info.filename.startswith('/'):
+                raise ValueError(f"Malicious path in ZIP: {zip_info.filename}")
+        
+        # Extract all files
+        zip_ref.extractall(target_dir)
+    
+    # Clean up temporary ZIP file
+    zip_path.unlink()
 
 class DocumentProcessor(BaseProcessor):
     """Processor for downloading and extracting project related documents"""
@@ -28,10 +48,15 @@ class DocumentProcessor(BaseProcessor):
     def name(self) -> str:
         return "DocumentProcessor"
     
-    async def process(self, dept_id: str) -> Dict[str, Any]:
+    async def process(
+        self,
+        dept_id: str,
+        inbox: Optional[asyncio.Queue] = None,
+        outbox: Optional[asyncio.Queue] = None
+    ) -> Dict[str, Any]:
             """Process document downloads for department announcements"""
-            announcements_rows = self.repository.get_pending_processing()
-            announcements = [announcement(row) for row in announcements_rows]
+            # The repository runs its queries on aiosqlite's worker thread
+            announcements = await self.repository.get_pending_processing()
             
             results = {
                 "total": len(announcements),
@@ -59,31 +84,30 @@ class DocumentProcessor(BaseProcessor):
         """Fetch document information from API"""
         params = {"projectId": project_id}
         
-        # Create SSL context that ignores verification
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
         try:
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(self.INFO_API_URL, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        if data["response"]["responseCode"] == "0":
-                            return data["data"]
-                        else:
-                            self.logger.warning(
-                                f"API error for project {project_id}: "
-                                f"{data['response']['description']}"
-                            )
+            # Shared keep-alive session: no new TLS handshake per project
+            session = await get_http_session()
+            async with session.get(
+                self.INFO_API_URL,
+                params=params,
+                ssl=NO_VERIFY_SSL
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    
+                    if data["response"]["responseCode"] == "0":
+                        return data["data"]
                     else:
-                        self.logger.error(
-                            f"Failed to fetch document info: {response.status}"
+                        self.logger.warning(
+                            f"API error for project {project_id}: "
+                            f"{data['response']['description']}"
                         )
-                    
-                    return None
+                else:
+                    self.logger.error(
+                        f"Failed to fetch document info: {response.status}"
+                    )
+                
+                return None
                     
         except Exception as e:
             self.logger.error(f"Error fetching document info: {e}")
@@ -106,34 +130,23 @@ class DocumentProcessor(BaseProcessor):
             # Download ZIP file
             params = {"fileId": zip_id}
             
-            # Create SSL context that ignores verification
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(self.DOWNLOAD_API_URL, params=params) as response:
-                    if response.status != 200:
-                        self.logger.error(f"Failed to download ZIP: {response.status}")
-                        return None
-                    
-                    # Save ZIP file
-                    async with aiofiles.open(temp_zip, 'wb') as f:
-                        await f.write(await response.read())
-            
-            # Extract ZIP file
-            with zipfile.ZipFile(temp_zip) as zip_ref:
-                # Check for malicious paths (path traversal)
-                for zip_info in zip_ref.filelist:
-                    if '..' in zip_info.filename or zip_info.filename.startswith('/'):
-                        raise ValueError(f"Malicious path in ZIP: {zip_info.filename}")
+            session = await get_http_session()
+            async with session.get(
+                self.DOWNLOAD_API_URL,
+                params=params,
+                ssl=NO_VERIFY_SSL
+            ) as response:
+                if response.status != 200:
+                    self.logger.error(f"Failed to download ZIP: {response.status}")
+                    return None
                 
-                # Extract all files
-                zip_ref.extractall(project_dir)
+                # Stream the ZIP to disk rather than holding it in memory
+                async with aiofiles.open(temp_zip, 'wb') as f:
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        await f.write(chunk)
             
-            # Clean up temporary ZIP file
-            temp_zip.unlink()
+            # Extract off the event loop so other downloads keep going
+            await asyncio.to_thread(_extract_safely, temp_zip, project_dir)
             
             return project_dir
             
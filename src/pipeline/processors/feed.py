@@ -1,18 +1,41 @@
 # src/pipeline/processors/feed.py
 
+import asyncio
+import codecs
+import io
+import re
 import aiohttp
-import xml.etree.ElementTree as ET
-from typing import Dict, Any, List, Optional
+import lxml.etree as LET
+from typing import Dict, Any, List, Literal, Optional
 from datetime import datetime
 from .base import BaseProcessor
 from src.core.config import config
 from src.db.repositories.announcement import AnnouncementRepository
 from src.db.models.announcement import Announcement
 from src.db.session import get_db
+from src.core.constants import Status
 from src.core.logging import get_logger
+from src.core.http import get_http_session
 
 logger = get_logger(__name__)
 
+# EGP serves its feeds in Thai Windows encoding; it's assumed only when the
+# feed declares no encoding of its own (or a UTF-8 byte order mark)
+FEED_ENCODING = "cp874"
+
+# Matches an encoding declared in the XML prolog
+_DECLARED_ENCODING = re.compile(rb"^\s*<\?xml[^>]*\bencoding\s*=", re.ASCII)
+
+# How far into a feed to look for its root element
+FEED_SNIFF_LENGTH = 1024
+
+# Announcements upserted per transaction when handing them on to the next
+# stage, which can start on one chunk while the next is being written
+FEED_UPSERT_CHUNK = 64
+
+# Detected feed type per department, so later fetches skip detection
+_feed_types: Dict[str, str] = {}
+
 class FeedProcessor(BaseProcessor):
     """Processor for EGP RSS feed"""
     def __init__(self):
@@ -23,44 +46,34 @@ class FeedProcessor(BaseProcessor):
     def name(self) -> str:
         return "FeedProcessor"
     
-    async def process(self, dept_id: str) -> Dict[str, Any]:
-        """Process feed for department"""
+    async def process(
+        self,
+        dept_id: str,
+        inbox: Optional[asyncio.Queue] = None,
+        outbox: Optional[asyncio.Queue] = None
+    ) -> Dict[str, Any]:
+        """Process feed for department
+        
+        With an outbox, stored announcements still pending processing are
+        put on it as each chunk is committed.
+        """
         try:
             feed_content = await self._fetch_feed(dept_id)
             if not feed_content:
                 return {"processed": 0, "error": "Failed to fetch feed"}
             
-            announcements = self._parse_feed(feed_content)
-            processed_results = []
+            feed_type = _feed_types.get(dept_id) or self._detect_feed_type(feed_content)
+            if feed_type != "rss":
+                self.logger.warning(f"Unsupported {feed_type} feed for department {dept_id}")
+                return {"processed": 0, "error": f"Unsupported feed type: {feed_type}"}
+            _feed_types[dept_id] = feed_type
+            
+            announcements = self._parse_feed(feed_content, config.feed_max_items)
             
             async with AnnouncementRepository() as repository:
-                for data in announcements:
-                    try:
-                        if not data.get("project_id"):
-                            continue
-                            
-                        announcement = Announcement(
-                            project_id=data["project_id"],
-                            title=data.get("title", ""),
-                            link=data.get("link", ""),
-                            description=data.get("description", ""),
-                            dept_id=dept_id
-                        )
-                        
-                        existing = await repository.get_by_project_id(announcement.project_id)
-                        saved = await repository.upsert(announcement)
-                        
-                        if saved:
-                            processed_results.append({
-                                "project_id": saved.project_id,
-                                "is_new": not existing
-                            })
-                            
-                    except Exception as e:
-                        self.logger.error(
-                            f"Error processing announcement {data.get('project_id')}: {e}"
-                        )
-                        continue
+                processed_results = await self._process_announcements(
+                    announcements, dept_id, repository, outbox
+                )
             
             return {
                 "processed": len(processed_results),
@@ -72,8 +85,8 @@ class FeedProcessor(BaseProcessor):
             self.logger.error(f"Error processing feed: {e}")
             return {"processed": 0, "error": str(e)}
 
-    async def _fetch_feed(self, dept_id: str) -> Optional[str]:
-        """Fetch feed content from EGP"""
+    async def _fetch_feed(self, dept_id: str) -> Optional[bytes]:
+        """Fetch raw feed content from EGP; the XML parser decodes it"""
         params = {
             "deptId": dept_id,
             "countbyday": ""
@@ -87,76 +100,107 @@ class FeedProcessor(BaseProcessor):
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    config.feed_base_url,
-                    params=params,
-                    headers=headers,
-                    timeout=config.feed_timeout
-                ) as response:
-                    if response.status == 200:
-                        content = await response.read()
-                        try:
-                            return content.decode('cp874')
-                        except UnicodeDecodeError:
-                            try:
-                                return content.decode('utf-8')
-                            except UnicodeDecodeError:
-                                return content.decode('utf-8', errors='replace')
-                    else:
-                        logger.error(f"Feed request failed with status {response.status}")
-                        return None
+            # Shared keep-alive session: no new TLS handshake per department
+            session = await get_http_session()
+            async with session.get(
+                config.feed_base_url,
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=config.feed_timeout)
+            ) as response:
+                if response.status == 200:
+                    return await response.read()
+                else:
+                    logger.error(f"Feed request failed with status {response.status}")
+                    return None
                         
         except Exception as e:
             logger.error(f"Error fetching feed: {e}")
             return None
 
-    def _parse_feed(self, content: str) -> List[Dict[str, Any]]:
-        """Parse XML feed content"""
-        try:
-            if content.startswith('\ufeff'):
-                content = content[1:]
+    def _detect_feed_type(self, content: bytes) -> Literal["rss", "atom", "unknown"]:
+        """Tell RSS from Atom by the root element near the start of the feed"""
+        head = content[:FEED_SNIFF_LENGTH]
+        if head.find(b"<rss") != -1:
+            return "rss"
+        if head.find(b"<feed") != -1:
+            return "atom"
+        return "unknown"
+
+    def _parse_feed(
+        self,
+        content: bytes,
+        max_items: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Parse XML feed content
+        
+        libxml2 streams the items out of the raw bytes; each one is cleared,
+        along with the ones before it, once read, so the tree never holds
+        more than one item. Parsing stops as soon as max_items announcements
+        have been collected.
+        
+        An encoding in the XML declaration is left to libxml2; without one
+        the feed is read as FEED_ENCODING. A feed that fails to parse either
+        way is retried once as UTF-8.
+        """
+        encoding = None
+        if content.startswith(codecs.BOM_UTF8):
+            content = content[len(codecs.BOM_UTF8):]
+            encoding = "utf-8"
+        elif not _DECLARED_ENCODING.match(content):
+            encoding = FEED_ENCODING
+        
+        attempts = [encoding] if encoding == "utf-8" else [encoding, "utf-8"]
+        for attempt in attempts:
+            try:
+                return self._iter_announcements(content, attempt, max_items)
+            except LET.LxmlError as e:
+                logger.error(f"Error parsing XML ({attempt or 'declared encoding'}): {e}")
+        return []
+
+    def _iter_announcements(
+        self,
+        content: bytes,
+        encoding: Optional[str],
+        max_items: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """Stream announcements out of feed bytes; raises LxmlError on bad XML"""
+        announcements = []
+        for _, item in LET.iterparse(
+            io.BytesIO(content),
+            tag="item",
+            recover=True,
+            encoding=encoding
+        ):
+            try:
+                announcement = {
+                    "title": item.findtext("title", "").strip(),
+                    "link": item.findtext("link", "").strip(),
+                    "description": item.findtext("description", "").strip(),
+                    "published_date": self._parse_date(
+                        item.findtext("pubDate", "").strip()
+                    )
+                }
                 
-            root = ET.fromstring(content)
-            announcements = []
-            
-            for item in root.findall(".//item"):
-                try:
-                    announcement = {
-                        "title": self._get_text(item, "title"),
-                        "link": self._get_text(item, "link"),
-                        "description": self._get_text(item, "description"),
-                        "published_date": self._parse_date(
-                            self._get_text(item, "pubDate")
-                        )
-                    }
-                    
-                    if announcement["description"]:
-                        parts = announcement["description"].split(",")
-                        if parts:
-                            announcement["project_id"] = parts[0].strip()
+                if announcement["description"]:
+                    parts = announcement["description"].split(",")
+                    if parts:
+                        announcement["project_id"] = parts[0].strip()
+                
+                if announcement.get("project_id"):
+                    announcements.append(announcement)
                     
-                    if announcement.get("project_id"):
-                        announcements.append(announcement)
-                        
-                except Exception as e:
-                    logger.error(f"Error parsing announcement: {e}")
-                    continue
-            
-            return announcements
+            except Exception as e:
+                logger.error(f"Error parsing announcement: {e}")
+            finally:
+                item.clear()
+                while item.getprevious() is not None:
+                    del item.getparent()[0]
             
-        except ET.ParseError as e:
-            logger.error(f"Error parsing XML: {e}")
-            return []
-
-    def _get_text(self, element: ET.Element, tag: str) -> str:
-        """Safely get element text"""
-        try:
-            child = element.find(tag)
-            return child.text.strip() if child is not None and child.text else ""
-        except Exception as e:
-            logger.error(f"Error getting text for tag {tag}: {e}")
-            return ""
+            if max_items and len(announcements) >= max_items:
+                break
+        
+        return announcements
 
     def _parse_date(self, date_str: str) -> datetime:
         """Parse date string to datetime"""
@@ -169,33 +213,28 @@ class FeedProcessor(BaseProcessor):
         self,
         announcements: List[Dict[str, Any]],
         dept_id: str,
-        repository: AnnouncementRepository
+        repository: AnnouncementRepository,
+        outbox: Optional[asyncio.Queue] = None
     ) -> List[Dict[str, Any]]:
-        """Process and store announcements"""
-        results = []
+        """Process and store announcements in batched upserts
+        
+        One upsert for the whole feed, or one per FEED_UPSERT_CHUNK when
+        handing announcements on to an outbox.
+        """
+        batch = []
         
         for data in announcements:
             try:
                 if not data.get("project_id"):
                     continue
                     
-                announcement = Announcement(
+                batch.append(Announcement(
                     project_id=data["project_id"],
                     title=data.get("title", ""),
                     link=data.get("link", ""),
                     description=data.get("description", ""),
                     dept_id=dept_id
-                )
-                
-                # Using the same repository instance with open connection
-                existing = repository.get_by_project_id(announcement.project_id)
-                saved = repository.upsert(announcement)
-                
-                if saved:
-                    results.append({
-                        "project_id": saved.project_id,
-                        "is_new": not existing
-                    })
+                ))
                     
             except Exception as e:
                 logger.error(
@@ -203,4 +242,30 @@ class FeedProcessor(BaseProcessor):
                 )
                 continue
         
-        return results
\ No newline at end of file
+        chunk_size = FEED_UPSERT_CHUNK if outbox is not None else len(batch) or 1
+        new_ids = set()
+        for start in range(0, len(batch), chunk_size):
+            chunk = batch[start:start + chunk_size]
+            new_ids |= await repository.upsert_many(chunk)
+            if outbox is not None:
+                await self._hand_off(chunk, repository, outbox)
+        
+        # A feed can list a project twice; report each once
+        return [
+            {"project_id": project_id, "is_new": project_id in new_ids}
+            for project_id in dict.fromkeys(ann.project_id for ann in batch)
+        ]
+
+    async def _hand_off(
+        self,
+        chunk: List[Announcement],
+        repository: AnnouncementRepository,
+        outbox: asyncio.Queue
+    ):
+        """Put the stored, still pending announcements of a chunk on the outbox"""
+        stored = await repository.get_many_by_project_ids(
+            [ann.project_id for ann in chunk]
+        )
+        for announcement in stored.values():
+            if announcement.status == Status.PENDING:
+                await outbox.put(announcement)
@@ -1,19 +1,24 @@
 # src/pipeline/processors/pdf.py
 
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, List, Optional
 from pathlib import Path
+import asyncio
 import PyPDF2
 import re
 from datetime import datetime
 import aiohttp
 import aiofiles
-import ssl
 
 from .base import BaseProcessor
 from src.core.config import config
 from src.db.repositories.announcement import AnnouncementRepository
+from src.db.models.announcement import Announcement
 from src.core.constants import Status, PDF_DOWNLOAD_TIMEOUT, ERROR_MESSAGES
 from src.core.logging import get_logger
+from src.core.http import get_http_session, NO_VERIFY_SSL
+
+# Processed announcements written back per transaction
+PDF_COMMIT_BATCH = 20
 
 class PDFProcessor(BaseProcessor):
     """Processor for downloading and extracting PDF content"""
@@ -25,8 +30,19 @@ class PDFProcessor(BaseProcessor):
     def name(self) -> str:
         return "PDFProcessor"
     
-    async def process(self, dept_id: str) -> Dict[str, Any]:
-        """Process PDFs for department announcements"""
+    async def process(
+        self,
+        dept_id: str,
+        inbox: Optional[asyncio.Queue] = None,
+        outbox: Optional[asyncio.Queue] = None
+    ) -> Dict[str, Any]:
+        """Process PDFs for department announcements
+        
+        Works through the announcements arriving on the inbox as they come,
+        then the department's stored pending ones (earlier failed downloads,
+        interrupted runs, projects gone from the feed). Without an inbox it
+        works through the stored pending backlog of every department.
+        """
         results = {
             "total": 0,
             "downloaded": 0,
@@ -37,11 +53,15 @@ class PDFProcessor(BaseProcessor):
         try:
             # Create repository within async context
             async with AnnouncementRepository() as repository:
-                # Get pending announcements
-                announcements = await repository.get_pending_processing()
-                results["total"] = len(announcements)
+                # Results are written in batches, one commit per batch
+                finished: List[Announcement] = []
                 
-                for announcement in announcements:
+                async for announcement in self._pending(repository, dept_id, inbox):
+                    results["total"] += 1
+                    if len(finished) >= PDF_COMMIT_BATCH:
+                        await self._save_results(repository, finished)
+                        finished.clear()
+                    
                     try:
                         # Download PDF
                         pdf_path = await self._download_pdf(
@@ -66,14 +86,11 @@ class PDFProcessor(BaseProcessor):
                             announcement.status = Status.COMPLETED
                             announcement.pdf_path = str(pdf_path)
                             
-                            await repository.update(announcement)
+                            finished.append(announcement)
                             results["processed"] += 1
                         else:
                             announcement.status = Status.FAILED
-                            await repository.update_status(
-                                announcement.id,
-                                Status.FAILED
-                            )
+                            finished.append(announcement)
                             results["failed"] += 1
                             
                     except Exception as e:
@@ -82,7 +99,9 @@ class PDFProcessor(BaseProcessor):
                         )
                         results["failed"] += 1
                         announcement.status = Status.FAILED
-                        await repository.update_status(announcement.id, Status.FAILED)
+                        finished.append(announcement)
+                
+                await self._save_results(repository, finished)
                 
         except Exception as e:
             self.logger.error(f"Error in PDFProcessor: {e}")
@@ -90,6 +109,42 @@ class PDFProcessor(BaseProcessor):
         
         return results
     
+    async def _pending(
+        self,
+        repository: AnnouncementRepository,
+        dept_id: str,
+        inbox: Optional[asyncio.Queue]
+    ) -> AsyncIterator[Announcement]:
+        """Announcements to process, from the inbox and the pending backlog"""
+        if inbox is None:
+            for announcement in await repository.get_pending_processing():
+                yield announcement
+            return
+        
+        # Snapshot the backlog first, but serve the inbox before it so the
+        # feed stage isn't held up; each announcement is processed once
+        backlog = await repository.get_pending_processing(dept_id=dept_id)
+        seen = set()
+        async for announcement in self.receive(inbox):
+            seen.add(announcement.project_id)
+            yield announcement
+        for announcement in backlog:
+            if announcement.project_id not in seen:
+                yield announcement
+    
+    async def _save_results(
+        self,
+        repository: AnnouncementRepository,
+        announcements: List[Announcement]
+    ):
+        """Write processed announcements back in a single transaction"""
+        async with repository.batch():
+            for announcement in announcements:
+                if announcement.status == Status.COMPLETED:
+                    await repository.update(announcement)
+                else:
+                    await repository.update_status(announcement.id, Status.FAILED)
+    
     async def _download_pdf(self, url: str, project_id: str) -> Optional[Path]:
         """Download PDF file"""
         # Just save directly to pdfs directory
@@ -105,32 +160,27 @@ class PDFProcessor(BaseProcessor):
         }
         
         try:
-            # Create SSL context that ignores verification
-            ssl_context = ssl.create_default_context()
-            ssl_context.check_hostname = False
-            ssl_context.verify_mode = ssl.CERT_NONE
-            
-            connector = aiohttp.TCPConnector(ssl=ssl_context)
-            async with aiohttp.ClientSession(connector=connector) as session:
-                async with session.get(
-                    url,
-                    headers=headers,
-                    timeout=PDF_DOWNLOAD_TIMEOUT
-                ) as response:
-                    if response.status == 200:
-                        content = await response.read()
-                        if content:
-                            async with aiofiles.open(pdf_path, 'wb') as f:
-                                await f.write(content)
-                            return pdf_path
-                        else:
-                            self.logger.error("Downloaded PDF is empty")
-                            return None
+            session = await get_http_session()
+            async with session.get(
+                url,
+                headers=headers,
+                ssl=NO_VERIFY_SSL,
+                timeout=aiohttp.ClientTimeout(total=PDF_DOWNLOAD_TIMEOUT)
+            ) as response:
+                if response.status == 200:
+                    content = await response.read()
+                    if content:
+                        async with aiofiles.open(pdf_path, 'wb') as f:
+                            await f.write(content)
+                        return pdf_path
                     else:
-                        self.logger.error(
-                            f"PDF download failed: {response.status}"
-                        )
+                        self.logger.error("Downloaded PDF is empty")
                         return None
+                else:
+                    self.logger.error(
+                        f"PDF download failed: {response.status}"
+                    )
+                    return None
         except Exception as e:
             self.logger.error(f"Error downloading PDF: {e}")
             return None
@@ -8,6 +8,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from src.core.logging import get_logger
 from src.core.config import config
+from src.core.cache import invalidate_caches
 from .orchestrator import PipelineOrchestrator
 
 logger = get_logger(__name__)
@@ -88,6 +89,7 @@ class PipelineScheduler:
                 f"Starting scheduled pipeline run at {datetime.now()}"
             )
             results = await self.orchestrator.run(dept_ids)
+            invalidate_caches()
             
             logger.info("Pipeline run completed")
             logger.info(f"Results: {results}")
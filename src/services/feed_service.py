@@ -1,17 +1,24 @@
 # src/services/feed_service.py
 
-from datetime import datetime, timedelta
+import hashlib
+from datetime import date
 from typing import Dict, List, Optional
 from src.db.repositories.announcement import AnnouncementRepository
 from src.core.logging import get_logger
+from src.core.cache import ttl_cache
 from src.core.constants import Status, DEPARTMENTS
 
 logger = get_logger(__name__)
 
+# Data only changes when the pipeline runs, which clears these caches
+ANNOUNCEMENTS_TTL = 600  # seconds
+STATISTICS_TTL = 3600  # seconds
+
 class FeedService:
     def __init__(self):
         self.repository = AnnouncementRepository()
     
+    @ttl_cache(ttl=ANNOUNCEMENTS_TTL, maxsize=512)
     async def get_announcements(
         self,
         dept_id: Optional[str] = None,
@@ -21,23 +28,10 @@ class FeedService:
     ) -> List[Dict]:
         """Get recent announcements with filters"""
         try:
-            announcements = self.repository.find_by(dept_id=dept_id) if dept_id \
-                else self.repository.get_all()
-            
-            # Filter by status if provided
-            if status:
-                announcements = [a for a in announcements if a.status == status]
-            
-            # Filter by date
-            cutoff_date = datetime.now() - timedelta(days=days)
-            announcements = [
-                a for a in announcements 
-                if a.created_at and a.created_at >= cutoff_date
-            ]
-            
-            # Sort by created_at descending and limit
-            announcements.sort(key=lambda x: x.created_at or datetime.min, reverse=True)
-            announcements = announcements[:limit]
+            # Filtering, ordering and limit all happen in SQL
+            announcements = await self.repository.get_recent_by_dept(
+                dept_id, status, days, limit
+            )
             
             return [ann.to_dict() for ann in announcements]
             
@@ -45,33 +39,43 @@ class FeedService:
             logger.error(f"Error getting announcements: {e}")
             raise
     
+    @ttl_cache(ttl=STATISTICS_TTL)
     async def get_statistics(self, days: int = 7) -> Dict:
         """Get announcement statistics"""
         try:
-            stats = self.repository.get_statistics(days)
+            stats = await self.repository.get_statistics(days)
             
             # Add department breakdown
-            dept_stats = {}
-            for dept_id in DEPARTMENTS:
-                dept_announcements = self.repository.find_by(dept_id=dept_id)
-                dept_stats[dept_id] = {
-                    "total": len(dept_announcements),
-                    "pending": len([a for a in dept_announcements if a.status == Status.PENDING]),
-                    "completed": len([a for a in dept_announcements if a.status == Status.COMPLETED]),
-                    "failed": len([a for a in dept_announcements if a.status == Status.FAILED])
-                }
-            
-            stats["departments"] = dept_stats
+            all_dept_stats = await self.repository.get_department_statistics()
+            empty = {"total": 0, "pending": 0, "completed": 0, "failed": 0}
+            stats["departments"] = {
+                dept_id: all_dept_stats.get(dept_id, dict(empty))
+                for dept_id in DEPARTMENTS
+            }
             return stats
             
         except Exception as e:
             logger.error(f"Error getting statistics: {e}")
             raise
     
+    @ttl_cache(ttl=ANNOUNCEMENTS_TTL)
+    async def get_etag(self) -> str:
+        """Entity tag for the announcement listings
+        
+        Built from the table's latest update and row count, plus today's date
+        because the day windows move even when the data doesn't.
+        """
+        updated_at, count = await self.repository.get_fingerprint()
+        digest = hashlib.blake2b(
+            f"{updated_at}|{count}|{date.today()}".encode(),
+            digest_size=8
+        ).hexdigest()
+        return f'"{digest}"'
+    
     async def get_announcement_details(self, project_id: str) -> Optional[Dict]:
         """Get detailed announcement information"""
         try:
-            announcement = self.repository.get_by_project_id(project_id)
+            announcement = await self.repository.get_by_project_id(project_id)
             return announcement.to_dict() if announcement else None
             
         except Exception as e:
@@ -1,30 +1,77 @@
 # src/services/pipeline_service.py
 
 from typing import Dict, List, Optional
+from uuid import uuid4
+from datetime import datetime
 from src.pipeline.scheduler import scheduler
 from src.core.logging import get_logger
-from src.core.constants import DEPARTMENTS
+from src.core.cache import invalidate_caches
+from src.core.constants import DEPARTMENTS, Status
 
 logger = get_logger(__name__)
 
+# Background runs remembered for status lookups; oldest are dropped first
+MAX_JOBS = 100
+
 class PipelineService:
+    def __init__(self):
+        self.jobs: Dict[str, Dict] = {}
+    
+    def validate_departments(self, dept_ids: Optional[List[str]] = None):
+        """Raise ValueError for department IDs that aren't configured"""
+        if dept_ids:
+            invalid_depts = [d for d in dept_ids if d not in DEPARTMENTS]
+            if invalid_depts:
+                raise ValueError(f"Invalid department IDs: {invalid_depts}")
+    
+    def create_job(self, dept_ids: Optional[List[str]] = None) -> str:
+        """Register a background pipeline run and return its job ID"""
+        self.validate_departments(dept_ids)
+        
+        while len(self.jobs) >= MAX_JOBS:
+            del self.jobs[next(iter(self.jobs))]
+        
+        job_id = uuid4().hex
+        self.jobs[job_id] = {
+            "status": Status.PROCESSING,
+            "dept_ids": dept_ids,
+            "started_at": datetime.now().isoformat()
+        }
+        return job_id
+    
+    async def run_job(self, job_id: str, dept_ids: Optional[List[str]] = None):
+        """Run a registered job, recording its outcome instead of raising"""
+        job = self.jobs.get(job_id, {})
+        try:
+            job["results"] = await self.start_pipeline(dept_ids)
+            job["status"] = Status.COMPLETED
+        except Exception as e:
+            job["error"] = str(e)
+            job["status"] = Status.FAILED
+        finally:
+            job["finished_at"] = datetime.now().isoformat()
+    
     async def start_pipeline(self, dept_ids: Optional[List[str]] = None) -> Dict:
         """Start pipeline run"""
         try:
             # Validate department IDs
-            if dept_ids:
-                invalid_depts = [d for d in dept_ids if d not in DEPARTMENTS]
-                if invalid_depts:
-                    raise ValueError(f"Invalid department IDs: {invalid_depts}")
+            self.validate_departments(dept_ids)
             
             # Run pipeline
             results = await scheduler.run_manual(dept_ids)
+            
+            # Cached announcements and statistics are now stale
+            invalidate_caches()
             return results
             
         except Exception as e:
             logger.error(f"Error starting pipeline: {e}")
             raise
     
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        """Get a background run by job ID"""
+        return self.jobs.get(job_id)
+    
     def get_pipeline_status(self) -> Dict:
         """Get current pipeline status"""
         try:
@@ -32,7 +79,10 @@ class PipelineService:
                 "scheduler_running": scheduler.scheduler.running,
                 "next_run": self._get_next_run_time(),
                 "pipeline_status": scheduler.orchestrator.status,
-                "last_run_results": scheduler.orchestrator.results
+                "last_run_results": scheduler.orchestrator.results,
+                "jobs": {
+                    job_id: job["status"] for job_id, job in self.jobs.items()
+                }
             }
         except Exception as e:
             logger.error(f"Error getting pipeline status: {e}")
@@ -18,12 +18,14 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
 from src.core.config import config
-from src.db.session import get_db
+from src.db.session import get_db, close_shared_connection
+from src.core.http import close_http_session
 from src.pipeline.processors.document import DocumentProcessor
 from src.pipeline.orchestrator import PipelineOrchestrator
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
+config.ensure_dirs()
 
 def load_latest_announcements(
     limit: int = 50, 
@@ -86,39 +88,37 @@ def load_latest_announcements(
 def create_test_announcement(project_id: str):
     """Create a test announcement record if it doesn't exist"""
     with get_db() as conn:
-        cursor = conn.cursor()
-        
         # Check if announcement exists
-        cursor.execute(
-            "SELECT * FROM announcements WHERE project_id = ?",
+        exists = conn.execute(
+            "SELECT 1 FROM announcements WHERE project_id = ?",
             (project_id,)
-        )
-        if cursor.fetchone():
+        ).fetchone()
+        if exists:
             return False
             
         # Create new announcement
         announcement_link = f"https://process3.gprocurement.go.th/egp2procmainWeb/procsearch.sch?announceType=2&servlet=FPRO9965Servlet&proc_id=FPRO9965_1&proc_name=Procure&processFlows=Procure&mode=LINK&homeflag=A&temp_projectId={project_id}"
         
-        cursor.execute("""
-            INSERT INTO announcements (
+        with conn:
+            conn.execute("""
+                INSERT INTO announcements (
+                    project_id,
+                    title,
+                    link,
+                    description,
+                    status,
+                    created_at,
+                    updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (
                 project_id,
-                title,
-                link,
-                description,
-                status,
-                created_at,
-                updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (
-            project_id,
-            f"Test Announcement {project_id}",
-            announcement_link,
-            "Test Description",
-            "pending",
-            datetime.now(),
-            datetime.now()
-        ))
-        conn.commit()
+                f"Test Announcement {project_id}",
+                announcement_link,
+                "Test Description",
+                "pending",
+                datetime.now(),
+                datetime.now()
+            ))
         return True
 
 async def run_test_orchestrator():
@@ -128,7 +128,12 @@ async def run_test_orchestrator():
         "0703", "0708", "0806", "0807", "1507", "1509", 
         "2502", "S315", "S505", "S506", "S601"
     ]
-    return await orchestrator.run(test_departments)
+    try:
+        return await orchestrator.run(test_departments)
+    finally:
+        # Outside the API nothing else owns the shared connections
+        await close_http_session()
+        await close_shared_connection()
 
 def run_orchestrator_and_update():
     """Run orchestrator and return results"""
@@ -340,6 +345,9 @@ async def show_document_tab():
                     st.error("No documents found for this project")
             except Exception as e:
                 st.error(f"Error fetching documents: {str(e)}")
+            finally:
+                # This runs under its own asyncio.run; nothing else owns the session
+                await close_http_session()
         
         # Show document preview if directory exists
         if project_dir.exists():
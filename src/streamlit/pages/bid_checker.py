@@ -1,15 +1,25 @@
 import streamlit as st
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import pandas as pd
 from typing import Dict, List
 import logging
+from operator import itemgetter
+import re
 import urllib3
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Only <input> fields and <table> blocks are read from the project page
+PARSE_ONLY = SoupStrainer(['input', 'table'])
+BIDDERS_TITLE = re.compile('รายชื่อผู้เสนอราคา')
+# Characters dropped from amounts before float(): baht sign, commas, whitespace
+_AMOUNT_STRIP = str.maketrans('', '', '฿, \t\n\r')
+
 class EGPClient:
     BASE_URL = "https://process3.gprocurement.go.th/egp2procmainWeb/procsearch.sch"
     
@@ -18,10 +28,17 @@ class EGPClient:
         self.headers = {
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.9,th;q=0.8',
+            'Accept-Encoding': 'gzip, deflate',
             'Content-Type': 'application/x-www-form-urlencoded',
             'Origin': 'https://process3.gprocurement.go.th',
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0 Safari/537.36'
         }
+        self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=3, backoff_factor=0.3)
+        ))
 
     def get_project_details(self, project_id: str) -> Dict:
         form_data = {
@@ -40,12 +57,11 @@ class EGPClient:
             response = self.session.post(
                 self.BASE_URL,
                 data=form_data,
-                headers=self.headers,
                 verify=False,
                 timeout=30
             )
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml', parse_only=PARSE_ONLY)
             project_info = self._extract_project_info(soup)
             bid_info = self._extract_bid_info(soup, project_info['reference_price'])
             
@@ -81,7 +97,7 @@ class EGPClient:
                 info['project_name'] = value
             elif name == 'priceBuild2' and value:
                 try:
-                    info['reference_price'] = float(value.replace(',', ''))
+                    info['reference_price'] = float(value.translate(_AMOUNT_STRIP))
                 except ValueError:
                     pass
                     
@@ -90,8 +106,9 @@ class EGPClient:
     def _extract_bid_info(self, soup: BeautifulSoup, reference_price: float) -> List[Dict]:
         """Extract bid information from HTML"""
         bids_table = None
-        for table in soup.find_all('table'):
-            if table.find('td', string=lambda t: t and 'รายชื่อผู้เสนอราคา' in t):
+        for text in soup.find_all(string=BIDDERS_TITLE):
+            table = text.find_parent('table')
+            if table and table.find('tr', class_='tr0'):
                 bids_table = table
                 break
 
@@ -102,22 +119,22 @@ class EGPClient:
         for row in bids_table.find_all('tr', class_='tr0'):
             cells = row.find_all('td')
             if len(cells) >= 5:
-                tax_ids = cells[2].get_text('\n').strip().split('\n')
-                companies = cells[3].get_text('\n').strip().split('\n')
-                amounts = cells[4].get_text('\n').strip().split('\n')
+                tax_ids = cells[2].stripped_strings
+                companies = cells[3].stripped_strings
+                amounts = cells[4].stripped_strings
                 
                 for tax_id, company, amount in zip(tax_ids, companies, amounts):
-                    bid_amount = float(amount.replace(',', ''))
+                    bid_amount = float(amount.translate(_AMOUNT_STRIP))
                     price_cut = ((bid_amount / reference_price) - 1) * 100
                     
                     bids.append({
-                        'tax_id': tax_id.strip(),
-                        'company': company.strip(),
+                        'tax_id': tax_id,
+                        'company': company,
                         'bid_amount': bid_amount,
                         'price_cut': price_cut
                     })
 
-        return sorted(bids, key=lambda x: x['bid_amount'])
+        return sorted(bids, key=itemgetter('bid_amount'))
 
 def format_currency(value: float) -> str:
     return f"฿{value:,.2f}"
@@ -125,12 +142,27 @@ def format_currency(value: float) -> str:
 def format_percentage(value: float) -> str:
     return f"{value:.1f}%"
 
+@st.cache_resource
+def get_client() -> EGPClient:
+    """Shared client so the pooled session survives Streamlit reruns"""
+    return EGPClient()
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_project_details(project_id: str) -> Dict:
+    """Fetch and parse a project once per hour instead of on every rerun
+    
+    Raises LookupError when the lookup fails; Streamlit doesn't cache
+    exceptions, so a failed project is fetched again next time.
+    """
+    result = get_client().get_project_details(project_id)
+    if not result['project']:
+        raise LookupError(project_id)
+    return result
+
 def main():
     st.set_page_config(page_title="EGP Project Explorer", layout="wide")
     st.title("🏛️ EGP Project Explorer")
     
-    client = EGPClient()
-    
     project_id = st.text_input(
         "Enter Project ID",
         help="Enter the 11-digit project ID from EGP system",
@@ -139,7 +171,10 @@ def main():
     
     if st.button("🔍 Get Project Details", type="primary", use_container_width=True):
         with st.spinner("Fetching project details..."):
-            result = client.get_project_details(project_id)
+            try:
+                result = fetch_project_details(project_id)
+            except LookupError:
+                result = {'project': {}, 'bids': []}
             
             if result['project']:
                 # Project Info Section
@@ -0,0 +1,150 @@
+# tests/test_core/test_cache.py
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from src.core import cache
+from src.core.cache import ttl_cache, invalidate_caches
+
+class Clock:
+    """Stand-in for time.monotonic that only moves when told to"""
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache.time, "monotonic", clock)
+    return clock
+
+def counting(**options):
+    """A cached async function that records each real call"""
+    calls = []
+
+    @ttl_cache(**options)
+    async def fetch(key, scale=1):
+        calls.append((key, scale))
+        await asyncio.sleep(0)
+        return key * scale
+
+    return fetch, calls
+
+def test_hit_until_expiry(clock):
+    fetch, calls = counting(ttl=10)
+
+    async def run():
+        assert await fetch(2) == 2
+        clock.now += 9.9
+        assert await fetch(2) == 2
+        assert calls == [(2, 1)]
+        clock.now += 0.1
+        assert await fetch(2) == 2
+        assert calls == [(2, 1), (2, 1)]
+
+    asyncio.run(run())
+
+def test_keyword_arguments_are_part_of_the_key(clock):
+    fetch, calls = counting(ttl=10)
+
+    async def run():
+        assert await fetch(2, scale=3) == 6
+        assert await fetch(2) == 2
+        assert await fetch(2, scale=3) == 6
+        assert calls == [(2, 3), (2, 1)]
+
+    asyncio.run(run())
+
+def test_maxsize_evicts_oldest(clock):
+    fetch, calls = counting(ttl=10, maxsize=2)
+
+    async def run():
+        await fetch(1)
+        await fetch(2)
+        await fetch(3)  # evicts 1
+        await fetch(2)
+        await fetch(1)
+        assert calls == [(1, 1), (2, 1), (3, 1), (1, 1)]
+
+    asyncio.run(run())
+
+def test_maxsize_evicts_expired_first(clock):
+    fetch, calls = counting(ttl=10, maxsize=2)
+
+    async def run():
+        await fetch(1)
+        clock.now += 5
+        await fetch(2)
+        clock.now += 6  # 1 has expired, 2 hasn't
+        await fetch(3)
+        await fetch(2)
+        assert calls == [(1, 1), (2, 1), (3, 1)]
+
+    asyncio.run(run())
+
+def test_cache_clear_and_invalidate_caches(clock):
+    fetch, calls = counting(ttl=10)
+    other, other_calls = counting(ttl=10)
+
+    async def run():
+        await fetch(1)
+        fetch.cache_clear()
+        await fetch(1)
+        assert calls == [(1, 1), (1, 1)]
+
+        await other(1)
+        invalidate_caches()
+        await fetch(1)
+        await other(1)
+        assert calls == [(1, 1)] * 3
+        assert other_calls == [(1, 1)] * 2
+
+    asyncio.run(run())
+
+def test_concurrent_misses_are_coalesced(clock):
+    fetch, calls = counting(ttl=10)
+
+    async def run():
+        results = await asyncio.gather(*(fetch(4) for _ in range(5)), fetch(5))
+        assert results == [4] * 5 + [5]
+        assert calls == [(4, 1), (5, 1)]
+
+    asyncio.run(run())
+
+def test_failed_call_is_not_cached(clock):
+    calls = []
+
+    @ttl_cache(ttl=10)
+    async def flaky():
+        calls.append(None)
+        if len(calls) == 1:
+            raise ValueError("first call fails")
+        return "ok"
+
+    async def run():
+        with pytest.raises(ValueError):
+            await flaky()
+        assert await flaky() == "ok"
+        assert len(calls) == 2
+
+    asyncio.run(run())
+
+def test_usable_from_successive_event_loops(clock):
+    fetch, calls = counting(ttl=10)
+
+    async def run():
+        fetch.cache_clear()
+        await asyncio.gather(fetch(1), fetch(1))
+
+    for _ in range(2):
+        asyncio.run(run())
+    assert calls == [(1, 1), (1, 1)]
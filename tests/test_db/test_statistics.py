@@ -0,0 +1,129 @@
+# tests/test_db/test_statistics.py
+
+import asyncio
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from src.core.config import config
+from src.core.constants import Status
+from src.db.models.announcement import Announcement
+from src.db.repositories.announcement import AnnouncementRepository
+from src.db.session import init_db, close_shared_connection
+
+DAYS = 7
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point the app at an empty database for the test"""
+    path = tmp_path / "egp.db"
+    monkeypatch.setattr(config, "db_path", path)
+    init_db()
+    yield path
+    asyncio.run(close_shared_connection())
+
+def counted(path: Path, days: int) -> dict:
+    """get_statistics computed straight from announcements"""
+    cutoff = (datetime.now().date() - timedelta(days=days)).isoformat()
+    conn = sqlite3.connect(path)
+    try:
+        row = conn.execute("""
+            SELECT COUNT(*),
+                COUNT(CASE WHEN status = ? THEN 1 END),
+                COUNT(CASE WHEN status = ? THEN 1 END),
+                COUNT(CASE WHEN status = ? THEN 1 END)
+            FROM announcements WHERE date(created_at) >= ?
+        """, (Status.PENDING.value, Status.COMPLETED.value, Status.FAILED.value, cutoff)).fetchone()
+    finally:
+        conn.close()
+    return dict(zip(("total", "pending", "completed", "failed"), row))
+
+def announcement(project_id: str, dept_id: str = "0703") -> Announcement:
+    return Announcement(
+        project_id=project_id, title="t", link="l", description="d", dept_id=dept_id
+    )
+
+def backdate(path: Path, project_ids: list, days_ago: int):
+    """Move rows' created_at into the past; the update trigger moves their counts"""
+    day = datetime.now() - timedelta(days=days_ago)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "UPDATE announcements SET created_at = ? WHERE project_id = ?",
+            [(day.isoformat(" "), project_id) for project_id in project_ids]
+        )
+    conn.close()
+
+async def assert_matches(repository: AnnouncementRepository, path: Path):
+    for days in (0, 1, 3, DAYS, 30):
+        assert await repository.get_statistics(days) == counted(path, days), days
+
+def test_statistics_follow_writes(db_path):
+    async def run():
+        repository = AnnouncementRepository()
+        await repository.upsert_many([
+            announcement(f"P{i}", dept_id="0703" if i % 2 else "0708") for i in range(12)
+        ])
+        repository._historical_stats.cache_clear()
+        await assert_matches(repository, db_path)
+        
+        # Spread rows over past days, inside and outside the window
+        backdate(db_path, ["P0", "P1", "P2"], 2)
+        backdate(db_path, ["P3", "P4"], 5)
+        backdate(db_path, ["P5"], DAYS + 3)
+        repository._historical_stats.cache_clear()
+        await assert_matches(repository, db_path)
+        
+        # Status changes, through both write paths
+        for project_id, status in (
+            ("P0", Status.COMPLETED), ("P3", Status.FAILED), ("P7", Status.COMPLETED)
+        ):
+            stored = await repository.get_by_project_id(project_id)
+            await repository.update_status(stored.id, status)
+        stored = await repository.get_by_project_id("P1")
+        stored.status = Status.FAILED
+        await repository.update(stored)
+        await assert_matches(repository, db_path)
+        
+        # A feed re-upsert resets status to pending
+        await repository.upsert(announcement("P7", dept_id="0703"))
+        await assert_matches(repository, db_path)
+        
+        # Deletes, today's and past rows
+        async with repository.batch():
+            await repository.execute_query(
+                "DELETE FROM announcements WHERE project_id IN ('P2', 'P4', 'P8')"
+            )
+        repository._historical_stats.cache_clear()
+        await assert_matches(repository, db_path)
+        
+        # Department totals cover every day
+        departments = await repository.get_department_statistics()
+        assert sum(stats["total"] for stats in departments.values()) == counted(db_path, 10_000)["total"]
+    
+    asyncio.run(run())
+
+def test_backfill_matches_announcements(db_path):
+    async def run():
+        repository = AnnouncementRepository()
+        await repository.upsert_many([announcement(f"B{i}") for i in range(6)])
+        await close_shared_connection()
+        backdate(db_path, ["B0", "B1"], 3)
+        
+        # A missing rollup is rebuilt from announcements on startup
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE daily_stats")
+        conn.close()
+        init_db()
+        
+        repository = AnnouncementRepository()
+        await assert_matches(repository, db_path)
+    
+    asyncio.run(run())
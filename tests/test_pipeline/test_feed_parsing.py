@@ -0,0 +1,46 @@
+# tests/test_pipeline/test_feed_parsing.py
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.append(str(project_root))
+
+from src.pipeline.processors.feed import FeedProcessor
+
+TITLE = "ประกาศเชิญชวน จ้างก่อสร้างถนน"
+
+def make_feed(encoding: str, declare: bool = True) -> bytes:
+    """One-item RSS feed in the given encoding"""
+    prolog = f'<?xml version="1.0" encoding="{encoding}"?>\n' if declare else ""
+    return (
+        f"{prolog}<rss><channel><item>"
+        f"<title>{TITLE}</title>"
+        f"<link>http://example.com/1</link>"
+        f"<description>67109000344,{TITLE}</description>"
+        f"</item></channel></rss>"
+    ).encode(encoding)
+
+def parse(content: bytes):
+    return FeedProcessor()._parse_feed(content)
+
+def test_utf8_feed():
+    items = parse(make_feed("UTF-8"))
+    assert [(a["project_id"], a["title"]) for a in items] == [("67109000344", TITLE)]
+
+def test_tis620_feed():
+    items = parse(make_feed("TIS-620"))
+    assert [(a["project_id"], a["title"]) for a in items] == [("67109000344", TITLE)]
+
+def test_undeclared_feed_is_cp874():
+    items = parse(make_feed("cp874", declare=False))
+    assert [a["title"] for a in items] == [TITLE]
+
+def test_undeclared_utf8_feed_falls_back():
+    items = parse(make_feed("utf-8", declare=False))
+    assert [a["title"] for a in items] == [TITLE]
+
+def test_utf8_bom_feed():
+    items = parse(b"\xef\xbb\xbf" + make_feed("utf-8", declare=False))
+    assert [a["title"] for a in items] == [TITLE]